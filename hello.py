@@ -1,3 +1,5 @@
+from itertools import batched
+
 from src.clients.adzuna import AdzunaClient
 from src.clients.getonboard import GetOnBoardClient
 from src.clients.jsearch import JSearchClient
@@ -5,7 +7,7 @@ from src.config import settings
 from src.models import JobListing, SearchCriteria
 from src.services.filter_service import FilterService
 from src.services.notifier import TelegramNotifier
-from src.services.storage_service import get_all_jobs
+from src.services.storage_service import iter_jobs
 from src.util.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -103,8 +105,12 @@ if __name__ == "__main__":
     # logger.info("Saved jobs to database.")
 
     # unnotified_jobs = get_unnotified_jobs()
-    all_jobs = get_all_jobs()
-    filtered_jobs = FilterService.filter_jobs(all_jobs)
+    # Re-filter the stored history one page at a time: only the accepted listings stay in memory
+    filtered_jobs = [
+        job
+        for chunk in batched(iter_jobs(), settings.DB_BATCH_SIZE, strict=False)
+        for job in FilterService.filter_batch(chunk)
+    ]
     for i, job in enumerate(filtered_jobs[:20]):
         log_jobs(job, i)
 
@@ -1,87 +1,123 @@
-import json
-
-import requests
+import math
+from collections.abc import AsyncIterator, Collection, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
+from src.clients.base import BaseJobClient
 from src.config import settings
 from src.models import JobListing, SearchCriteria
 from src.util.logger_config import get_logger
-from src.util.normalizer import extract_modality_from_text, extract_seniority_from_title
 
 logger = get_logger(__name__)
 
 
-class AdzunaClient:
-    BASE_URL = "https://api.adzuna.com/v1/api/jobs/us/search/1"  # Defaulting to US, can be configurable
+class AdzunaClient(BaseJobClient):
+    SOURCE = "Adzuna"
+    BASE_URL = "https://api.adzuna.com/v1/api/jobs/us/search"  # Defaulting to US, can be configurable
+    PER_PAGE = 20
+    MAX_PER_PAGE = 50
+
+    def iter_jobs(
+        self,
+        criteria: SearchCriteria,
+        max_results: int | None = None,
+        per_page: int | None = None,
+        known_ids: Collection[str] = (),
+        posted_after: datetime | None = None,
+        *,
+        filter_recent: bool = True,
+        recent_days: int = 2,
+        **options: Any,
+    ) -> Iterator[JobListing]:
+        return super().iter_jobs(
+            criteria,
+            max_results,
+            per_page,
+            known_ids,
+            self._posted_after(posted_after, filter_recent, recent_days),
+            filter_recent=filter_recent,
+            recent_days=recent_days,
+            **options,
+        )
 
-    def _calculate_salary(
+    async def aiter_pages(
         self,
-        min_salary: int | None,
-        max_salary: int | None,
-    ) -> int:
-        if min_salary is not None and max_salary is not None:
-            return int((min_salary + max_salary) / 2)
-        elif min_salary is not None:
-            return int(min_salary)
-        elif max_salary is not None:
-            return int(max_salary)
-        else:
-            return 0
+        criteria: SearchCriteria,
+        max_results: int | None = None,
+        per_page: int | None = None,
+        known_ids: Collection[str] = (),
+        posted_after: datetime | None = None,
+        *,
+        filter_recent: bool = True,
+        recent_days: int = 2,
+        **options: Any,
+    ) -> AsyncIterator[list[JobListing]]:
+        pages = super().aiter_pages(
+            criteria,
+            max_results,
+            per_page,
+            known_ids,
+            self._posted_after(posted_after, filter_recent, recent_days),
+            filter_recent=filter_recent,
+            recent_days=recent_days,
+            **options,
+        )
+        async for jobs in pages:
+            yield jobs
+
+    @staticmethod
+    def _posted_after(posted_after: datetime | None, filter_recent: bool, recent_days: int) -> datetime | None:
+        """Without an explicit bound, max_days_old also bounds the pagination."""
+        if posted_after is None and filter_recent:
+            return datetime.now(UTC) - timedelta(days=recent_days)
+        return posted_after
+
+    def _since(self, posted_after: datetime, options: dict[str, Any]) -> dict[str, Any]:
+        if not options.get("filter_recent", True):
+            return options
+        age_days = (datetime.now(UTC) - posted_after).total_seconds() / 86400
+        return {**options, "recent_days": max(1, math.ceil(age_days))}
+
+    def _url(self, page: int) -> str:
+        return f"{self.base_url}/{page}"
 
-    def search_jobs(
-        self, criteria: SearchCriteria, filter_recent: bool = True, recent_days: int = 2
-    ) -> list[JobListing]:
+    def _request(
+        self,
+        criteria: SearchCriteria,
+        page: int,
+        per_page: int,
+        *,
+        filter_recent: bool = True,
+        recent_days: int = 2,
+        **options: Any,
+    ) -> dict[str, Any]:
         params = {
             "app_id": settings.ADZUNA_APP_ID,
             "app_key": settings.ADZUNA_API_KEY.get_secret_value(),
-            "results_per_page": 20,
+            "results_per_page": per_page,
             "what": criteria.query,
             "where": criteria.location,
             "content-type": "application/json",
             "max_days_old": recent_days if filter_recent else None,
         }
+        return {"params": params}
 
-        try:
-            response = requests.get(self.BASE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            with open("adzuna.json", "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-
-            jobs = []
-            if "results" in data:
-                for item in data["results"]:
-                    # Filter by date if enabled
-                    created_date = item.get("created")
-                    title = item.get("title", "")
-                    description = item.get("description", "")
-
-                    # Extract seniority from title
-                    seniority = extract_seniority_from_title(title)
-
-                    # Extract modality from title and description
-                    modality = extract_modality_from_text(f"{title} {description}")
-
-                    jobs.append(
-                        JobListing(
-                            id=str(item.get("id", "")),
-                            title=title,
-                            company_name=item.get("company", {}).get("display_name", ""),
-                            location=", ".join(item.get("location", {}).get("area", [])),
-                            description=description,
-                            url=item.get("redirect_url", ""),
-                            salary=self._calculate_salary(item.get("salary_min"), item.get("salary_max")),
-                            source="Adzuna",
-                            posted_date=created_date,
-                            seniority=seniority,
-                            modality=modality,
-                        )
+    def _parse(self, data: dict[str, Any]) -> list[JobListing]:
+        jobs = []
+        if "results" in data:
+            for item in data["results"]:
+                # Seniority and modality are extracted later by classify_jobs
+                jobs.append(
+                    JobListing(
+                        id=str(item.get("id", "")),
+                        title=item.get("title", ""),
+                        company_name=item.get("company", {}).get("display_name", ""),
+                        location=", ".join(item.get("location", {}).get("area", [])),
+                        description=item.get("description", ""),
+                        url=item.get("redirect_url", ""),
+                        salary=self._calculate_salary(item.get("salary_min"), item.get("salary_max")),
+                        source="Adzuna",
+                        posted_date=item.get("created"),
                     )
-            logger.info(jobs)
-            return jobs
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"Adzuna API HTTP error: {e} | Response: {e.response.text}")
-            return []
-        except Exception as e:
-            logger.error(f"Error fetching from Adzuna: {e}")
-            return []
+                )
+        return jobs
@@ -0,0 +1,275 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Collection, Iterator
+from datetime import datetime
+from typing import Any
+
+import httpx
+import requests
+
+from src.clients.errors import (
+    BudgetExhaustedError,
+    ProviderError,
+    ProviderRequestError,
+    ProviderUnavailableError,
+    RateLimitedError,
+    parse_retry_after,
+)
+from src.clients.pagination import Paginator
+from src.config import settings
+from src.models import JobListing
+from src.services.classifier import classify_jobs
+from src.util.http_client import AsyncHttpTransport, HttpTransport, get_async_transport, get_transport
+from src.util.logger_config import get_logger
+from src.util.normalizer import normalize_jobs
+from src.util.rate_limiter import RequestBudget, backoff_delay, get_rate_limiter
+from src.util.response_cache import CachedResponse, ResponseCache, cache_key, get_response_cache
+
+logger = get_logger(__name__)
+
+Response = requests.Response | httpx.Response | CachedResponse
+
+
+class BaseJobClient:
+    """
+    Shared plumbing for the provider clients.
+
+    Subclasses build the request for one page (``_request``) and turn a successful
+    response into listings (``_parse``); this class walks the pages with a
+    ``Paginator`` over either the pooled sync transport or the event loop's async
+    transport, so both APIs share one code path.
+
+    ``iter_jobs``/``aiter_pages`` stream raw listings page by page and are meant to
+    feed ``normalize_jobs`` and ``classify_jobs``; ``search_jobs``/``asearch_jobs`` are
+    list-returning convenience wrappers that already apply them. With ``posted_after``
+    the provider is asked for newer listings only, where its API can filter by date
+    (``_since``).
+
+    Pages go through the on-disk ``ResponseCache`` (unless HTTP_CACHE_ENABLED is off),
+    so retries and repeated runs of the same query don't spend API quota again.
+    Requests that do go out count against the run's ``budget``, if any, and wait
+    for the provider's shared rate limiter; 429s, 5xx answers and network failures
+    are retried with backoff (honouring ``Retry-After``) and then raised as
+    ``ProviderError``s instead of being swallowed, so the flow's task retries can
+    react to them.
+    """
+
+    SOURCE = "Unknown"
+    BASE_URL = ""
+    PER_PAGE = 10
+    MAX_PER_PAGE = 10
+
+    def __init__(
+        self,
+        transport: HttpTransport | None = None,
+        base_url: str | None = None,
+        async_transport: AsyncHttpTransport | None = None,
+        cache: ResponseCache | None = None,
+        budget: RequestBudget | None = None,
+    ):
+        self.transport = transport or get_transport()
+        self.async_transport = async_transport
+        self.cache = cache or get_response_cache()
+        self.budget = budget
+        self.limiter = get_rate_limiter(self.SOURCE)
+        self.base_url = base_url or self.BASE_URL
+
+    def search_jobs(self, criteria: Any, **kwargs: Any) -> list[JobListing]:
+        return list(classify_jobs(normalize_jobs(self.iter_jobs(criteria, **kwargs))))
+
+    async def asearch_jobs(self, criteria: Any, **kwargs: Any) -> list[JobListing]:
+        return [
+            job async for page in self.aiter_pages(criteria, **kwargs) for job in classify_jobs(normalize_jobs(page))
+        ]
+
+    def iter_jobs(
+        self,
+        criteria: Any,
+        max_results: int | None = None,
+        per_page: int | None = None,
+        known_ids: Collection[str] = (),
+        posted_after: datetime | None = None,
+        **options: Any,
+    ) -> Iterator[JobListing]:
+        paginator = self._paginator(max_results, per_page, known_ids, posted_after)
+        if posted_after is not None:
+            options = self._since(posted_after, options)
+        pages = paginator.pages(
+            lambda page: self._fetch(criteria, page=page, per_page=paginator.per_page, **options),
+        )
+        for jobs in pages:
+            yield from jobs
+
+    async def aiter_pages(
+        self,
+        criteria: Any,
+        max_results: int | None = None,
+        per_page: int | None = None,
+        known_ids: Collection[str] = (),
+        posted_after: datetime | None = None,
+        **options: Any,
+    ) -> AsyncIterator[list[JobListing]]:
+        paginator = self._paginator(max_results, per_page, known_ids, posted_after)
+        if posted_after is not None:
+            options = self._since(posted_after, options)
+        pages = paginator.apages(
+            lambda page: self._afetch(criteria, page=page, per_page=paginator.per_page, **options),
+        )
+        async for jobs in pages:
+            yield jobs
+
+    def request_key(self, criteria: Any, **options: Any) -> str:
+        """Identifies what the provider is asked for ``criteria``: the URL and params of its first page."""
+        request = self._request(criteria, page=1, per_page=self.PER_PAGE, **options)
+        return cache_key(self.SOURCE, self._url(1), request.get("params"))
+
+    def _paginator(
+        self,
+        max_results: int | None,
+        per_page: int | None,
+        known_ids: Collection[str],
+        posted_after: datetime | None,
+    ) -> Paginator:
+        return Paginator(
+            per_page=min(per_page or self.PER_PAGE, self.MAX_PER_PAGE),
+            max_results=max_results or settings.MAX_RESULTS_PER_SOURCE.get(self.SOURCE, self.PER_PAGE),
+            known_ids=known_ids,
+            posted_after=posted_after,
+            source=self.SOURCE,
+        )
+
+    def _since(self, posted_after: datetime, options: dict[str, Any]) -> dict[str, Any]:
+        """
+        ``_request`` options asking the provider for listings posted after ``posted_after``.
+        By default the provider isn't asked and only the Paginator stops at older pages.
+        """
+        return options
+
+    def _request(self, criteria: Any, page: int, per_page: int, **options: Any) -> dict[str, Any]:
+        """
+        Returns the keyword arguments (params, headers, ...) for the GET request of one page.
+        ``options`` are the extra keyword arguments given to ``iter_jobs``/``aiter_pages``;
+        each client reads the ones it knows.
+        """
+        raise NotImplementedError
+
+    def _url(self, page: int) -> str:
+        return self.base_url
+
+    def _parse(self, data: dict[str, Any]) -> list[JobListing]:
+        raise NotImplementedError
+
+    def _calculate_salary(
+        self,
+        min_salary: int | None,
+        max_salary: int | None,
+    ) -> int:
+        if min_salary is not None and max_salary is not None:
+            return int((min_salary + max_salary) / 2)
+        elif min_salary is not None:
+            return int(min_salary)
+        elif max_salary is not None:
+            return int(max_salary)
+        else:
+            return 0
+
+    def _handle_response(self, response: Response) -> list[JobListing]:
+        status = response.status_code or 0  # requests types it Optional; a received response always has one
+        if status == 429:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            raise RateLimitedError(self.SOURCE, "rate limited (HTTP 429)", retry_after)
+        if status >= 500:
+            raise ProviderUnavailableError(self.SOURCE, f"HTTP {status}", status)
+        if status >= 400:
+            raise ProviderRequestError(self.SOURCE, f"HTTP {status} | Response: {response.text[:500]}", status)
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise ProviderRequestError(self.SOURCE, f"invalid JSON in HTTP {status} response", status) from e
+        return self._parse(data)
+
+    def _lookup(self, url: str, request: dict[str, Any]) -> CachedResponse | None:
+        """Cached response for the request; a stale one adds its conditional headers to ``request``."""
+        if self.cache is None:
+            return None
+        cached = self.cache.lookup(self.SOURCE, url, request.get("params"))
+        if cached is not None and not cached.fresh:
+            request["headers"] = {**request.get("headers", {}), **cached.validators()}
+        return cached
+
+    def _store(
+        self,
+        url: str,
+        request: dict[str, Any],
+        response: requests.Response | httpx.Response,
+        cached: CachedResponse | None,
+    ) -> Response:
+        if self.cache is None:
+            return response
+        return self.cache.store(self.SOURCE, url, request.get("params"), response, cached)
+
+    def _retry_delay(self, error: ProviderError, attempt: int) -> float:
+        """Seconds to wait before retrying after ``error``; re-raises it when retrying here can't help."""
+        retry_after = getattr(error, "retry_after", None)
+        if (
+            not error.retryable
+            or attempt >= settings.HTTP_MAX_RETRIES
+            or (retry_after or 0) > settings.HTTP_BACKOFF_MAX_SECONDS
+        ):
+            raise error
+        if retry_after is not None:
+            self.limiter.pause(retry_after)  # holds back every worker of this provider, not just this one
+        delay = backoff_delay(attempt, retry_after)
+        logger.warning(f"{error}, retrying in {delay:.1f}s ({attempt + 1}/{settings.HTTP_MAX_RETRIES})")
+        return delay
+
+    def _spend(self):
+        if self.budget is not None and not self.budget.spend():
+            raise BudgetExhaustedError(self.SOURCE, f"request budget of {self.budget.limit} used up")
+
+    def _get(self, url: str, request: dict[str, Any]) -> requests.Response:
+        self._spend()
+        self.limiter.acquire()
+        try:
+            return self.transport.get(url, **request)
+        except requests.RequestException as e:
+            raise ProviderUnavailableError(self.SOURCE, f"request failed: {e}") from e
+
+    async def _aget(self, url: str, request: dict[str, Any]) -> httpx.Response:
+        self._spend()
+        await self.limiter.aacquire()
+        transport = self.async_transport or get_async_transport()
+        try:
+            return await transport.get(url, **request)
+        except httpx.HTTPError as e:
+            raise ProviderUnavailableError(self.SOURCE, f"request failed: {e!r}") from e
+
+    def _fetch(self, criteria: Any, page: int, **options: Any) -> list[JobListing]:
+        url, request = self._url(page), self._request(criteria, page=page, **options)
+        cached = self._lookup(url, request)
+        if cached is not None and cached.fresh:
+            return self._handle_response(cached)
+
+        attempt = 0
+        while True:
+            try:
+                response = self._get(url, request)
+                return self._handle_response(self._store(url, request, response, cached))
+            except ProviderError as error:
+                time.sleep(self._retry_delay(error, attempt))
+                attempt += 1
+
+    async def _afetch(self, criteria: Any, page: int, **options: Any) -> list[JobListing]:
+        url, request = self._url(page), self._request(criteria, page=page, **options)
+        cached = self._lookup(url, request)
+        if cached is not None and cached.fresh:
+            return self._handle_response(cached)
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._aget(url, request)
+                return self._handle_response(self._store(url, request, response, cached))
+            except ProviderError as error:
+                await asyncio.sleep(self._retry_delay(error, attempt))
+                attempt += 1
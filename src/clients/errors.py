@@ -0,0 +1,70 @@
+"""
+Errors raised by the provider clients.
+
+``retryable`` tells the orchestration whether trying again later can help: rate
+limits and server/network failures can, a rejected request (bad key, bad params)
+or an unparseable body cannot.
+"""
+
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+
+class ProviderError(Exception):
+    retryable = False
+
+    def __init__(self, source: str, message: str, status_code: int | None = None):
+        super().__init__(f"{source}: {message}")
+        self.source = source
+        self.status_code = status_code
+
+
+class ProviderRequestError(ProviderError):
+    """The provider rejected the request (4xx other than 429) or sent a body that could not be parsed."""
+
+
+class ProviderUnavailableError(ProviderError):
+    """5xx answer, timeout or connection failure."""
+
+    retryable = True
+
+
+class RateLimitedError(ProviderUnavailableError):
+    """429 answer; ``retry_after`` is the wait the provider asked for, in seconds, if it sent one."""
+
+    def __init__(self, source: str, message: str, retry_after: float | None = None):
+        super().__init__(source, message, status_code=429)
+        self.retry_after = retry_after
+
+
+class BudgetExhaustedError(ProviderError):
+    """The run already sent the provider as many requests as its budget allows (REQUEST_BUDGETS)."""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header (delay in seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(UTC)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: BaseException | None) -> bool:
+    """Provider errors say whether they are; anything else (e.g. a storage error) is assumed transient."""
+    return not isinstance(error, ProviderError) or error.retryable
+
+
+def retry_condition(task: Any, task_run: Any, state: Any) -> bool:
+    """Prefect ``retry_condition_fn``: retries a failed task unless its error says retrying can't help."""
+    try:
+        state.result()
+    except Exception as error:
+        return is_retryable(error)
+    return True
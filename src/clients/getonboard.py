@@ -1,73 +1,55 @@
 import json
+from typing import Any
 
-import requests
-
+from src.clients.base import BaseJobClient
 from src.models import JobListing, SearchCriteria
 from src.util.logger_config import get_logger
-from src.util.normalizer import html_to_markdown_basic, normalize_location, normalize_modality, normalize_seniority
+from src.util.normalizer import (
+    html_to_markdown_basic,
+    normalize_location,
+    normalize_modality,
+    normalize_seniority,
+    parse_datetime,
+)
 
 logger = get_logger(__name__)
 
 
-class GetOnBoardClient:
+class GetOnBoardClient(BaseJobClient):
+    SOURCE = "GetOnBoard"
     BASE_URL = "https://www.getonbrd.com/api/v0/search/jobs"
-
-    def _calculate_salary(
-        self,
-        min_salary: int | None,
-        max_salary: int | None,
-    ) -> int:
-        if min_salary is not None and max_salary is not None:
-            return int((min_salary + max_salary) / 2)
-        elif min_salary is not None:
-            return int(min_salary)
-        elif max_salary is not None:
-            return int(max_salary)
-        else:
-            return 0
-
-    def search_jobs(self, criteria: SearchCriteria, per_page: int = 10) -> list[JobListing]:
-        params = {"query": criteria.query, "per_page": 10, "country_code": "CL"}
-
-        try:
-            response = requests.request("GET", url=self.BASE_URL, params=params)
-
-            if response.status_code == 200:
-                data = response.json()
-                jobs = []
-                if "data" in data:
-                    for item in data["data"]:
-                        logger.debug(json.dumps(item, indent=4))
-
-                        attrs = item.get("attributes", {})
-
-                        # attributes
-                        seniority_id = attrs.get("seniority", {}).get("data", {}).get("id")
-                        description = f"{attrs.get('description', 'No especificado')}\n"
-                        f"{attrs.get('functions', 'No especificado')}\n"
-                        (f"{attrs.get('desirable', 'No especificado')}",)
-                        jobs.append(
-                            JobListing(
-                                id=item.get("id", ""),
-                                title=attrs.get("title", ""),
-                                company_name=attrs.get("company", {})
-                                .get("data", "")
-                                .get("attributes", {})
-                                .get("name", ""),
-                                location=normalize_location(attrs.get("countries", "")),
-                                description=html_to_markdown_basic(description),
-                                url=item.get("links", {}).get("public_url", ""),
-                                source="GetOnBoard",
-                                posted_date=None,
-                                seniority=normalize_seniority(seniority_id),
-                                modality=normalize_modality(attrs.get("remote_modality", "")),
-                                salary=self._calculate_salary(attrs.get("min_salary"), attrs.get("max_salary")),
-                            )
-                        )
-                return jobs
-            else:
-                logger.warning(f"GetOnBoard API status: {response.status_code} | {response.text}")
-                return []
-        except Exception as e:
-            logger.exception(f"Error fetching from GetOnBoard: {e}")
-            return []
+    PER_PAGE = 10
+    MAX_PER_PAGE = 100
+
+    def _request(self, criteria: SearchCriteria, page: int, per_page: int, **options: Any) -> dict[str, Any]:
+        return {"params": {"query": criteria.query, "page": page, "per_page": per_page, "country_code": "CL"}}
+
+    def _parse(self, data: dict[str, Any]) -> list[JobListing]:
+        jobs = []
+        if "data" in data:
+            for item in data["data"]:
+                logger.debug(json.dumps(item, indent=4))
+
+                attrs = item.get("attributes", {})
+
+                # attributes
+                seniority_id = attrs.get("seniority", {}).get("data", {}).get("id")
+                description = f"{attrs.get('description', 'No especificado')}\n"
+                f"{attrs.get('functions', 'No especificado')}\n"
+                (f"{attrs.get('desirable', 'No especificado')}",)
+                jobs.append(
+                    JobListing(
+                        id=item.get("id", ""),
+                        title=attrs.get("title", ""),
+                        company_name=attrs.get("company", {}).get("data", "").get("attributes", {}).get("name", ""),
+                        location=normalize_location(attrs.get("countries", "")),
+                        description=html_to_markdown_basic(description),
+                        url=item.get("links", {}).get("public_url", ""),
+                        source="GetOnBoard",
+                        posted_date=parse_datetime(attrs.get("published_at")),  # Unix seconds
+                        seniority=normalize_seniority(seniority_id),
+                        modality=normalize_modality(attrs.get("remote_modality", "")),
+                        salary=self._calculate_salary(attrs.get("min_salary"), attrs.get("max_salary")),
+                    )
+                )
+        return jobs
@@ -1,22 +1,33 @@
-import requests
+from datetime import UTC, datetime
+from typing import Any
 
+from src.clients.base import BaseJobClient
 from src.config import settings
 from src.models import JobListing, SearchCriteria
 from src.util.logger_config import get_logger
-from src.util.normalizer import extract_modality_from_text, extract_seniority_from_title, normalize_location
+from src.util.normalizer import normalize_location
 
 logger = get_logger(__name__)
 
 
-class JSearchClient:
+class JSearchClient(BaseJobClient):
+    SOURCE = "JSearch"
     BASE_URL = "https://jsearch.p.rapidapi.com/search"
+    # JSearch pages are fixed at 10 results; num_pages > 1 just bundles pages into one call
+    PER_PAGE = 10
+    MAX_PER_PAGE = 10
 
-    def search_jobs(
-        self,
-        criteria: SearchCriteria,
-        page: int = 1,
-        num_pages: int = 1,
-    ) -> list[JobListing]:
+    # date_posted windows, narrowest first
+    DATE_WINDOWS = (("today", 1), ("3days", 3), ("week", 7), ("month", 30))
+
+    def _since(self, posted_after: datetime, options: dict[str, Any]) -> dict[str, Any]:
+        age_days = (datetime.now(UTC) - posted_after).total_seconds() / 86400
+        window = next((name for name, days in self.DATE_WINDOWS if age_days <= days), "all")
+        return {**options, "date_posted": window}
+
+    def _request(
+        self, criteria: SearchCriteria, page: int, per_page: int, *, date_posted: str | None = None, **options: Any
+    ) -> dict[str, Any]:
         headers = {
             "X-RapidAPI-Key": settings.JSEARCH_API_KEY.get_secret_value(),
             "X-RapidAPI-Host": "jsearch.p.rapidapi.com",
@@ -25,47 +36,31 @@ class JSearchClient:
         querystring = {
             "query": criteria.query,
             "page": str(page),
-            "num_pages": str(num_pages),
+            "num_pages": "1",
             "country": criteria.location,
-            "date_posted": criteria.date_posted,
+            "date_posted": date_posted or criteria.date_posted,
         }
+        return {"headers": headers, "params": querystring}
 
-        try:
-            response = requests.get(self.BASE_URL, headers=headers, params=querystring)
-            response.raise_for_status()
-            data = response.json()
-
-            jobs = []
-            if "data" in data:
-                for item in data["data"]:
-                    # Filter by date if enabled
-                    title = item.get("job_title", "")
-                    description = item.get("job_description", "")
-
-                    # Extract seniority from title
-                    seniority = extract_seniority_from_title(title)
-
-                    # Extract modality from title, description, and job_is_remote flag
-                    if item.get("job_is_remote"):
-                        modality = "Remote"
-                    else:
-                        modality = extract_modality_from_text(f"{title} {description}")
+    def _parse(self, data: dict[str, Any]) -> list[JobListing]:
+        jobs = []
+        if "data" in data:
+            for item in data["data"]:
+                # Trust the job_is_remote flag; otherwise classify_jobs extracts seniority and
+                # modality from the title and description
+                modality = "Remote" if item.get("job_is_remote") else None
 
-                    jobs.append(
-                        JobListing(
-                            id=item.get("job_id", ""),
-                            title=title,
-                            company_name=item.get("employer_name", ""),
-                            location=normalize_location(item.get("job_country", "")),
-                            description=description,
-                            url=item.get("job_apply_link", ""),
-                            source=item.get("job_publisher", "JSearch"),
-                            posted_date=item.get("job_posted_at_datetime_utc", ""),
-                            seniority=seniority,
-                            modality=modality,
-                        )
+                jobs.append(
+                    JobListing(
+                        id=item.get("job_id", ""),
+                        title=item.get("job_title", ""),
+                        company_name=item.get("employer_name", ""),
+                        location=normalize_location(item.get("job_country", "")),
+                        description=item.get("job_description", ""),
+                        url=item.get("job_apply_link", ""),
+                        source=item.get("job_publisher", "JSearch"),
+                        posted_date=item.get("job_posted_at_datetime_utc", ""),
+                        modality=modality,
                     )
-            return jobs
-        except Exception as e:
-            logger.error(f"Error fetching from JSearch: {e}")
-            return []
+                )
+        return jobs
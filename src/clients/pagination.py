@@ -0,0 +1,87 @@
+import asyncio
+import math
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.config import settings
+from src.models import JobListing
+from src.util.logger_config import get_logger
+from src.util.normalizer import parse_datetime
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Paginator:
+    """
+    Walks a provider's result pages, ``concurrency`` pages at a time, in page order.
+
+    The walk stops as soon as one of these holds:
+      - the page is empty or shorter than ``per_page`` (last page),
+      - every listing on the page is already in ``known_ids``,
+      - every dated listing on the page is older than ``posted_after``,
+      - ``max_results`` listings have been yielded (the per-source budget).
+
+    Page 1 is fetched on its own; the following pages ``concurrency`` at a time.
+    Pages already in flight when the walk stops are discarded, so ``concurrency``
+    bounds the waste as well as the parallelism.
+    """
+
+    per_page: int
+    max_results: int
+    concurrency: int = settings.PAGINATION_CONCURRENCY
+    known_ids: Collection[str] = ()
+    posted_after: datetime | None = None
+    first_page: int = 1
+    source: str = ""
+
+    def pages(self, fetch_page: Callable[[int], list[JobListing]]) -> Iterator[list[JobListing]]:
+        remaining = self.max_results
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for window in self._windows():
+                for page in executor.map(fetch_page, window):
+                    jobs, done = self._accept(page, remaining)
+                    remaining -= len(jobs)
+                    if jobs:
+                        yield jobs
+                    if done:
+                        return
+
+    async def apages(self, fetch_page: Callable[[int], Awaitable[list[JobListing]]]) -> AsyncIterator[list[JobListing]]:
+        remaining = self.max_results
+        for window in self._windows():
+            for page in await asyncio.gather(*(fetch_page(number) for number in window)):
+                jobs, done = self._accept(page, remaining)
+                remaining -= len(jobs)
+                if jobs:
+                    yield jobs
+                if done:
+                    return
+
+    def _windows(self) -> Iterator[range]:
+        # The first page goes alone: most queries fit in one page (or have none), and
+        # only a full first page is worth a concurrent window
+        last_page = self.first_page + math.ceil(self.max_results / self.per_page)
+        yield range(self.first_page, min(self.first_page + 1, last_page))
+        for start in range(self.first_page + 1, last_page, self.concurrency):
+            yield range(start, min(start + self.concurrency, last_page))
+
+    def _accept(self, page: list[JobListing], remaining: int) -> tuple[list[JobListing], bool]:
+        """Returns the part of ``page`` to keep and whether the walk should stop."""
+        if not page:
+            return [], True
+
+        if self.known_ids and all(job.id in self.known_ids for job in page):
+            logger.info(f"{self.source}: page only contains known listings, stopping.")
+            return [], True
+
+        if self.posted_after is not None:
+            dates = [date for job in page if (date := parse_datetime(job.posted_date)) is not None]
+            if dates and max(dates) < self.posted_after:
+                logger.info(f"{self.source}: page is older than {self.posted_after:%Y-%m-%d}, stopping.")
+                return [], True
+
+        jobs = page[:remaining]
+        return jobs, len(page) < self.per_page or len(jobs) >= remaining
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,5 +19,79 @@ class Settings(BaseSettings):
     DEFAULT_QUERY: str = "Junior Data Engineer"
     DEFAULT_LOCATION: str = "cl"
 
+    # Source fan-out
+    FETCH_TIMEOUT_SECONDS: float = 120.0
+    FETCH_MIN_SOURCES: int = 1
+
+    # HTTP transport
+    HTTP_POOL_CONNECTIONS: int = 10
+    HTTP_POOL_MAXSIZE: int = 10
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 30.0
+
+    # Provider throttling and retries (requests per second per provider, shared by all workers)
+    RATE_LIMITS: dict[str, float] = {"JSearch": 1.0, "GetOnBoard": 2.0, "Adzuna": 0.4}
+    RATE_LIMIT_DEFAULT: float = 1.0
+    RATE_LIMIT_BURST: int = 3
+    HTTP_MAX_RETRIES: int = 3
+    HTTP_BACKOFF_BASE_SECONDS: float = 1.0
+    HTTP_BACKOFF_MAX_SECONDS: float = 60.0  # longer Retry-After waits are left to the flow's retries
+
+    # Provider response cache (SQLite); see src/util/response_cache.py
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_PATH: Path = Path(__file__).parent.parent / ".cache" / "http_responses.sqlite"
+    HTTP_CACHE_TTL_SECONDS: float = 3600.0
+    HTTP_CACHE_MAX_BYTES: int = 50 * 1024 * 1024
+
+    # Pagination
+    PAGINATION_CONCURRENCY: int = 3
+    MAX_RESULTS_PER_SOURCE: dict[str, int] = {"JSearch": 20, "GetOnBoard": 50, "Adzuna": 50}
+
+    # Search plan: every query x location x source (see src/services/search_scheduler.py)
+    SEARCH_QUERIES: list[str] = ["Junior Data Engineer", "Data Engineer"]
+    SEARCH_LOCATIONS: list[str] = ["cl"]
+    SEARCH_SOURCES: list[str] = ["JSearch", "GetOnBoard", "Adzuna"]
+    SEARCH_DATE_POSTED: str | None = "today"
+    SEARCH_CONCURRENCY: int = 4  # requests of one provider in flight at once
+    REQUEST_BUDGETS: dict[str, int] = {"JSearch": 4, "GetOnBoard": 20, "Adzuna": 10}  # API calls per provider per run
+
+    # Incremental fetching (see src/services/checkpoint_service.py)
+    INCREMENTAL_FETCH: bool = True
+    CHECKPOINT_OVERLAP_HOURS: float = 6.0  # re-read this far behind the newest posted_date seen (late indexing)
+    CHECKPOINT_MAX_IDS: int = 500  # most recent listing IDs remembered per source and query
+
+    # Storage
+    DB_BATCH_SIZE: int = 200
+
+    # Filtering and ranking
+    FILTER_RULES_PATH: Path = Path(__file__).parent / "filter_rules.toml"
+    SCORE_RECENCY_WEIGHT: float = 3.0
+    SCORE_RECENCY_HALF_LIFE_DAYS: float = 2.0
+
+    # Near-duplicate detection (MinHash/LSH)
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.7
+    DEDUP_TITLE_THRESHOLD: float = 0.6  # word overlap (Jaccard) the titles need on their own
+    DEDUP_NUM_PERM: int = 64
+    DEDUP_BANDS: int = 16
+    DEDUP_DESCRIPTION_WORDS: int = 0  # leading description words shingled too (0 = title/company/location only)
+
+    # Notifications
+    NOTIFY_TOP_K: int | None = None  # cap on listings per chat per outbox drain, best first (None = all)
+    NOTIFY_PREVIEW_CHARS: int = 800  # description preview per listing in a notification
+    TELEGRAM_MESSAGE_LIMIT: int = 4096
+    TELEGRAM_WORKERS: int = 4  # chats sent to concurrently; one chat's messages always go out in order
+    TELEGRAM_CHAT_RATE: float = 1.0  # messages per second per chat
+    TELEGRAM_CHAT_BURST: int = 1  # Telegram allows about one message per second in a chat, without bursts
+    TELEGRAM_CHAT_BUCKETS: int = 1000  # per-chat rate limiters kept, least recently used dropped first
+    TELEGRAM_GLOBAL_RATE: float = 30.0  # messages per second for the whole bot
+    TELEGRAM_MAX_RETRIES: int = 3
+
+    # Notification outbox (see src/services/outbox_service.py)
+    OUTBOX_BATCH_SIZE: int = 50  # messages claimed per drain round
+    OUTBOX_LEASE_SECONDS: float = 300.0  # a claim older than this is given to the next drain
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETRY_SECONDS: float = 60.0  # doubled after every failed attempt
+
 
 settings = Settings()  # ty:ignore[missing-argument]
@@ -0,0 +1,84 @@
+import asyncio
+from collections import Counter
+
+from prefect import flow, get_run_logger, task
+from prefect.tasks import exponential_backoff
+
+from src.clients.errors import retry_condition
+from src.config import settings
+from src.services.delivery_service import drain_outbox
+from src.services.search_scheduler import PlannedRequest, arun_source, build_plan
+from src.services.storage_service import init_db
+from src.util.http_client import close_async_transport
+
+
+@task(
+    name="Scout Source Jobs",
+    retries=3,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_condition,
+)
+async def ascout_source_jobs(source: str, requests: list[PlannedRequest]) -> dict[str, int]:
+    """
+    Runs every request of one provider at once on the current event loop.
+    Each page goes through the streaming pipeline as soon as it arrives; the
+    blocking filter/storage work runs in a worker thread to keep the loop free.
+    """
+    return await arun_source(source, requests)
+
+
+@task(name="Deliver Notifications")
+async def adeliver_notifications() -> dict[str, int]:
+    # No task retries: undelivered messages stay in the outbox for the next drain
+    return await asyncio.to_thread(drain_outbox)
+
+
+@flow(name="Job Scouting Flow (async)")
+async def job_flow_async(queries: list[str] | None = None):
+    logger = get_run_logger()
+    # 0. Create the tables, columns and indexes missing from the database
+    await asyncio.to_thread(init_db)
+    plan = build_plan(queries)
+
+    # 1. Fetch, filter and save every planned request from every source concurrently,
+    #    sharing one event loop and connection pool
+    try:
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(ascout_source_jobs(source, requests), settings.FETCH_TIMEOUT_SECONDS)
+                for source, requests in plan.items()
+            ),
+            return_exceptions=True,
+        )
+    finally:
+        await close_async_transport()
+
+    totals: Counter[str] = Counter()
+    succeeded: list[str] = []
+    for source, result in zip(plan, results, strict=True):
+        if isinstance(result, TimeoutError):
+            logger.warning(
+                f"{source}: no response within {settings.FETCH_TIMEOUT_SECONDS:.0f}s, continuing without it."
+            )
+        elif isinstance(result, BaseException):
+            logger.error(f"{source}: fetch failed, continuing without it: {result}")
+        else:
+            succeeded.append(source)
+            totals.update(result)
+
+    logger.info(f"Sources completed: {len(succeeded)}/{len(plan)} ({', '.join(succeeded) or 'none'})")
+    if len(succeeded) < settings.FETCH_MIN_SOURCES:
+        raise RuntimeError(
+            f"Only {len(succeeded)} of {len(plan)} sources succeeded (minimum {settings.FETCH_MIN_SOURCES})."
+        )
+
+    logger.info(f"Pipeline totals: {dict(totals)}")
+
+    # 2. Deliver what storage queued in the notification outbox
+    delivery = await adeliver_notifications()
+    logger.info(f"Notifications: {delivery}")
+
+
+if __name__ == "__main__":
+    asyncio.run(job_flow_async())
@@ -1,91 +1,97 @@
+import time
+from collections import Counter
+
 from prefect import flow, get_run_logger, task
+from prefect.futures import PrefectFuture
+from prefect.tasks import exponential_backoff
 
-from src.clients.getonboard import GetOnBoardClient
-from src.clients.jsearch import JSearchClient
+from src.clients.errors import retry_condition
 from src.config import settings
-from src.models import JobListing, SearchCriteria
-from src.services.filter_service import FilterService
-from src.services.notifier import TelegramNotifier
-from src.services.storage_service import (
-    get_unnotified_jobs,
-    mark_jobs_as_notified,
-    save_jobs,
-)
+from src.services.delivery_service import drain_outbox
+from src.services.search_scheduler import PlannedRequest, build_plan, run_source
+from src.services.storage_service import init_db
 
 
-@task(name="Fetch JSearch Jobs", retries=3, retry_delay_seconds=5)
-def fetch_jsearch_jobs(criteria: SearchCriteria) -> list[JobListing]:
+@task(
+    name="Scout Source Jobs",
+    retries=3,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_condition,
+)
+def scout_source_jobs(source: str, requests: list[PlannedRequest]) -> dict[str, int]:
+    # No task timeout: Prefect cannot interrupt blocking I/O in a sync task. Each request is
+    # bounded by the HTTP connect/read timeouts and gather_sources owns the overall deadline.
+    # Requests that completed before a retry resume from their checkpoint, so a retry is cheap
+    return run_source(source, requests)
+
+
+def gather_sources(
+    futures: dict[str, PrefectFuture[dict[str, int]]],
+    timeout: float = settings.FETCH_TIMEOUT_SECONDS,
+    min_sources: int = settings.FETCH_MIN_SOURCES,
+) -> dict[str, int]:
+    """
+    Collect the results of concurrently submitted scout tasks.
+
+    Every source shares the same deadline, measured from the moment collection starts,
+    so the total wait tracks the slowest source instead of the sum of all of them.
+    Sources that fail or miss the deadline are logged and dropped (partial results);
+    the flow only fails if fewer than ``min_sources`` sources delivered.
+
+    This is the only fetch deadline: a source that misses it keeps running in its
+    worker thread until its HTTP timeouts fire, but the flow no longer waits for it.
+    """
     logger = get_run_logger()
-    jobs = JSearchClient().search_jobs(criteria, num_pages=2)
-    logger.info(f"JSearch: found {len(jobs)} jobs.")
-    return jobs
+    deadline = time.monotonic() + timeout
+    totals: Counter[str] = Counter()
+    succeeded: list[str] = []
 
+    for name, future in futures.items():
+        remaining = max(deadline - time.monotonic(), 0)
+        try:
+            source_stats = future.result(timeout=remaining)
+        except TimeoutError:
+            logger.warning(f"{name}: no response within {timeout:.0f}s, continuing without it.")
+            continue
+        except Exception as e:
+            logger.error(f"{name}: fetch failed, continuing without it: {e}")
+            continue
 
-@task(name="Fetch GetOnBoard Jobs", retries=3, retry_delay_seconds=5)
-def fetch_getonboard_jobs(criteria: SearchCriteria) -> list[JobListing]:
-    logger = get_run_logger()
-    jobs = GetOnBoardClient().search_jobs(criteria)
-    logger.info(f"GetOnBoard: found {len(jobs)} jobs.")
-    return jobs
+        succeeded.append(name)
+        totals.update(source_stats)
 
+    logger.info(f"Sources completed: {len(succeeded)}/{len(futures)} ({', '.join(succeeded) or 'none'})")
+    if len(succeeded) < min_sources:
+        raise RuntimeError(f"Only {len(succeeded)} of {len(futures)} sources succeeded (minimum {min_sources}).")
 
-@task(name="Filter Jobs")
-def filter_results(jobs: list[JobListing]) -> list[JobListing]:
-    logger = get_run_logger()
-    logger.info(f"Initial jobs: {len(jobs)}")
-    filtered_jobs = FilterService.filter_jobs(jobs)
-    logger.info(f"Filtered jobs: {len(filtered_jobs)}")
-    return filtered_jobs
+    return dict(totals)
 
 
-@task(name="Notify User", retries=3, retry_delay_seconds=60)
-def notify_user(jobs: list[JobListing]):
-    logger = get_run_logger()
-    logger.info(f"Sending {len(jobs)} notifications")
-    return TelegramNotifier().notify(jobs)
+@task(name="Deliver Notifications")
+def deliver_notifications() -> dict[str, int]:
+    # No task retries: undelivered messages stay in the outbox for the next drain
+    return drain_outbox()
 
 
 @flow(name="Job Scouting Flow")
 def job_flow():
     logger = get_run_logger()
-    # 1. Initialize Database
-    criteria_jsearch = SearchCriteria(
-        query="Junior Data Engineer",
-        location=settings.DEFAULT_LOCATION,
-        date_posted="today",
-    )
-    criteria_getonboard = SearchCriteria(
-        query="Data Engineer",
-        location=settings.DEFAULT_LOCATION,
-    )
-
-    # 2. Fetch Jobs
-    jsearch_jobs = fetch_jsearch_jobs(criteria_jsearch)
-
-    getonboard_jobs = fetch_getonboard_jobs(criteria_getonboard)  #  GetOnBoard might be empty
-
-    all_jobs = getonboard_jobs + jsearch_jobs
-
-    # 3. Filter Jobs (Business Logic)
-    filtered_jobs = filter_results(all_jobs)
-
-    # 4. Save to DB (Deduplication happens here)
-    save_jobs(filtered_jobs)
-
-    # 5. Get only NEW (unnotified) jobs for notification
-    new_jobs_to_notify = get_unnotified_jobs()
+    # 0. Create the tables, columns and indexes missing from the database
+    init_db()
 
-    if not new_jobs_to_notify:
-        logger.info("No new jobs to notify.")
-        return
+    # 1. Expand the configured queries x locations x sources, merging identical requests
+    plan = build_plan()
 
-    # 6. Notify
-    notify_user(new_jobs_to_notify)
+    # 2-4. Fetch, filter and save, streamed per source (all sources run concurrently).
+    # Deduplication happens in storage, which also queues new jobs in the notification outbox.
+    futures = {source: scout_source_jobs.submit(source, requests) for source, requests in plan.items()}
+    stats = gather_sources(futures)
+    logger.info(f"Pipeline totals: {stats}")
 
-    # 7. Mark as Notified
-    # Extract IDs to mark as notified
-    job_ids = [job.id for job in new_jobs_to_notify]
-    mark_jobs_as_notified(job_ids)
+    # 5. Deliver the queued notifications; each one is marked sent only once Telegram accepted it
+    delivery = deliver_notifications()
+    logger.info(f"Notifications: {delivery}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+from prefect import flow, get_run_logger
+
+from src.services.delivery_service import drain_outbox
+from src.services.storage_service import init_db
+
+
+@flow(name="Notification Delivery Flow")
+def notification_flow() -> dict[str, int]:
+    """Drains the notification outbox on its own schedule, independently from the scouting runs."""
+    logger = get_run_logger()
+    init_db()  # the outbox table may not exist yet on a fresh or older database
+    stats = drain_outbox()
+    logger.info(f"Notifications: {stats}")
+    return stats
+
+
+if __name__ == "__main__":
+    notification_flow.serve(
+        name="notification-delivery",
+        cron="*/15 * * * *",
+        tags=["production"],
+    )
@@ -1,10 +1,17 @@
 from datetime import UTC, datetime
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index, UniqueConstraint, text
 from sqlmodel import Field, SQLModel
 
 
 class JobListing(SQLModel, table=True):
+    __table_args__ = (
+        # Partial index: only pending rows are indexed, so it stays small while the history grows
+        Index("ix_joblisting_unnotified", "created_at", sqlite_where=text("is_notified = 0")),
+        # Keyset pagination key for the streaming readers
+        Index("ix_joblisting_created_at_id", "created_at", "id"),
+    )
+
     id: str = Field(primary_key=True)
     title: str
     company_name: str
@@ -14,9 +21,10 @@ class JobListing(SQLModel, table=True):
     description: str | None = None
     url: str
     salary: int | None = None
-    posted_date: datetime | None = None
-    source: str  # e.g., "JSearch", "Adzuna", "GetOnBoard"
+    posted_date: datetime | None = Field(default=None, index=True)
+    source: str = Field(index=True)  # e.g., "JSearch", "Adzuna", "GetOnBoard"
     tags: list[str] = Field(default_factory=list, sa_column=Column(JSON))
+    score: float | None = None  # relevance, set by ScoringService
 
     # Tracking fields
     is_notified: bool = Field(default=False)
@@ -30,3 +38,61 @@ class SearchCriteria(SQLModel):
     seniority: str | None = None
     experience_years: int | None = None
     date_posted: datetime | str | None = None
+
+
+class JobFingerprint(SQLModel, table=True):
+    """MinHash signature of a stored listing, used for cross-source near-duplicate detection."""
+
+    job_id: str = Field(primary_key=True)
+    signature: list[int] = Field(default_factory=list, sa_column=Column(JSON))
+
+
+class LshBucket(SQLModel, table=True):
+    """LSH band bucket -> listing; the primary key doubles as the lookup index on ``bucket``."""
+
+    bucket: int = Field(primary_key=True)
+    job_id: str = Field(primary_key=True)
+
+
+class OutboxMessage(SQLModel, table=True):
+    """
+    A listing waiting to be delivered to one chat. The ID doubles as idempotency key
+    (``chat_id:job_id``), so a listing is never queued twice for the same chat.
+    """
+
+    __table_args__ = (Index("ix_outboxmessage_status_available_at", "status", "available_at"),)
+
+    id: str = Field(primary_key=True)
+    job_id: str = Field(index=True)
+    chat_id: str
+    status: str = "pending"  # pending -> sending -> sent, or failed after OUTBOX_MAX_ATTEMPTS
+    attempts: int = 0
+    last_error: str | None = None
+    available_at: datetime = Field(default_factory=lambda: datetime.now(UTC))  # next claim / lease expiry
+    claim_token: str | None = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    sent_at: datetime | None = None
+
+
+class Subscription(SQLModel, table=True):
+    """A chat subscribed to the listings accepted by one filter profile (src/filter_rules.toml)."""
+
+    __table_args__ = (UniqueConstraint("chat_id", "profile"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    chat_id: str = Field(index=True)
+    profile: str = "default"
+    active: bool = True
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class FetchCheckpoint(SQLModel, table=True):
+    """How far a source has been read for one query: the high-water mark of incremental fetching."""
+
+    source: str = Field(primary_key=True)
+    query_key: str = Field(primary_key=True)  # checkpoint_service.query_key or the planned request key
+    query: str = ""  # the criteria, for humans
+    last_posted_at: datetime | None = None  # newest posted_date seen
+    seen_ids: list[str] = Field(default_factory=list, sa_column=Column(JSON))  # most recent first
+    fetched: int = 0  # listings read by the last run
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
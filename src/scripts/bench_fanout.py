@@ -0,0 +1,64 @@
+"""
+Subscription fan-out: the shared pass (Audience.match, one scan per listing and one
+evaluation per profile) vs. filtering the listings once per subscriber.
+The per-subscriber cost is measured on a sample of subscribers and extrapolated.
+
+Usage: uv run python -m src.scripts.bench_fanout [listings] [subscribers]
+"""
+
+import sys
+import time
+
+from src.scripts.bench_filter import _jobs
+from src.services.rule_engine import get_rule_engine
+from src.services.subscription_service import Audience
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_LISTINGS = 5_000
+DEFAULT_SUBSCRIBERS = 5_000
+SAMPLE_SUBSCRIBERS = 20
+
+
+def bench(listings: int, subscribers: int):
+    engine = get_rule_engine()
+    profiles = engine.profiles
+    subscriptions = [(f"chat-{i}", profiles[i % len(profiles)]) for i in range(subscribers)]
+    chats_by_profile: dict[str, list[str]] = {}
+    for chat_id, profile in subscriptions:
+        chats_by_profile.setdefault(profile, []).append(chat_id)
+    audience = Audience(chats_by_profile)
+    jobs = _jobs(listings)
+
+    start = time.perf_counter()
+    shared = {}
+    for job in jobs:
+        _, chats = audience.match(job)
+        for chat_id in chats:
+            shared.setdefault(chat_id, []).append(job.id)
+    shared_seconds = time.perf_counter() - start
+
+    sample = subscriptions[:SAMPLE_SUBSCRIBERS]
+    start = time.perf_counter()
+    naive = {}
+    for chat_id, profile in sample:
+        accepted = [job.id for job in jobs if engine.evaluate_job(job, [profile])[profile].accepted]
+        if accepted:
+            naive[chat_id] = accepted
+    naive_seconds = (time.perf_counter() - start) * subscribers / len(sample)
+
+    if any(shared.get(chat_id) != naive.get(chat_id) for chat_id, _ in sample):
+        raise SystemExit("Shared pass and per-subscriber filtering disagree.")
+
+    deliveries = sum(map(len, shared.values()))
+    logger.info(f"{listings} listings x {subscribers} subscribers on {len(profiles)} profiles: {deliveries} deliveries")
+    logger.info(f"per subscriber: {naive_seconds:.1f}s (extrapolated from {len(sample)} subscribers)")
+    logger.info(f"shared pass:    {shared_seconds:.3f}s ({naive_seconds / shared_seconds:.0f}x)")
+
+
+if __name__ == "__main__":
+    bench(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LISTINGS,
+        int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SUBSCRIBERS,
+    )
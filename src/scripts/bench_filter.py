@@ -0,0 +1,73 @@
+"""
+Per-item (iter_filter) vs. batch (filter_columns) filtering over synthetic listings.
+Also checks that both paths select exactly the same rows.
+
+Usage: uv run python -m src.scripts.bench_filter [rows]
+"""
+
+import random
+import sys
+import time
+
+from src.models import JobListing
+from src.services.filter_service import FilterService
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_ROWS = 100_000
+
+TITLES = [
+    "Junior Data Engineer",
+    "Senior Backend Developer",
+    "Semi Senior Data Analyst",
+    "Tech Lead",
+    "Analista de Datos",
+    "Frontend Developer",
+    "Engineering Manager",
+    "Trainee Data Scientist",
+]
+SAMPLE_TEXT = (
+    "we are looking for a motivated engineer to join our team and build reliable pipelines with python sql "
+    "airflow dbt aws docker pandas spark kafka react node java scala kubernetes terraform stakeholders "
+    "remote hybrid benefits salary growth mentoring leadership architecture principal responsibilities"
+)
+
+
+def _jobs(rows: int) -> list[JobListing]:
+    rng = random.Random(42)
+    words = SAMPLE_TEXT.split()
+    return [
+        JobListing(
+            id=f"job-{i}",
+            title=rng.choice(TITLES),
+            company_name=f"Company {i % 500}",
+            description=" ".join(rng.choices(words, k=rng.randint(50, 250))) if i % 20 else None,
+            url=f"https://example.com/{i}",
+            source="bench",
+        )
+        for i in range(rows)
+    ]
+
+
+def bench(rows: int):
+    jobs = _jobs(rows)
+
+    start = time.perf_counter()
+    per_item = list(FilterService.iter_filter(jobs))
+    per_item_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = FilterService.filter_batch(jobs)
+    batch_seconds = time.perf_counter() - start
+
+    if [job.id for job in per_item] != [job.id for job in batch]:
+        raise SystemExit("Batch and per-item filtering disagree.")
+
+    logger.info(f"{rows} rows, {len(batch)} selected (both paths agree)")
+    logger.info(f"per-item: {per_item_seconds:.3f}s")
+    logger.info(f"batch:    {batch_seconds:.3f}s ({per_item_seconds / batch_seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS)
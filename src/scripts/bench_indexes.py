@@ -0,0 +1,96 @@
+"""
+Query time vs. table size, before and after the JobListing indexes.
+Runs against a throwaway local SQLite file, so no Turso credentials are needed.
+
+Usage: uv run python -m src.scripts.bench_indexes [rows ...]
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import Engine, insert, inspect
+from sqlmodel import col, create_engine, select
+
+from src.models import JobListing
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+SOURCES = ["JSearch", "Adzuna", "GetOnBoard", "LinkedIn", "Indeed"]
+REPEAT = 20
+
+NOW = datetime.now(UTC)
+QUERIES = {
+    "unnotified": select(JobListing.id).where(col(JobListing.is_notified) == False),  # noqa: E712
+    "by source": select(JobListing.id).where(JobListing.source == "Adzuna"),
+    "created last day": select(JobListing.id).where(JobListing.created_at >= NOW - timedelta(days=1)),
+    "posted last week": select(JobListing.id).where(col(JobListing.posted_date) >= NOW - timedelta(days=7)),
+}
+
+
+def _populate(engine: Engine, rows: int):
+    table = inspect(JobListing).local_table
+    table.create(engine)
+    for index in table.indexes:
+        index.drop(engine)
+
+    # ~1% of the history is still pending, as in steady state
+    records = [
+        {
+            "id": f"job-{i}",
+            "title": f"Data Engineer {i}",
+            "company_name": f"Company {i % 500}",
+            "description": "Lorem ipsum " * 40,
+            "url": f"https://example.com/{i}",
+            "source": SOURCES[i % len(SOURCES)],
+            "posted_date": NOW - timedelta(hours=i % (24 * 90)),
+            "created_at": NOW - timedelta(minutes=i),
+            "is_notified": i % 100 != 0,
+            "tags": [],
+        }
+        for i in range(rows)
+    ]
+    with engine.begin() as connection:
+        connection.execute(insert(table), records)
+
+
+def _time_queries(engine: Engine) -> dict[str, float]:
+    timings = {}
+    with engine.connect() as connection:
+        for name, statement in QUERIES.items():
+            samples = []
+            for _ in range(REPEAT):
+                start = time.perf_counter()
+                connection.execute(statement).fetchall()
+                samples.append(time.perf_counter() - start)
+            timings[name] = statistics.median(samples) * 1000
+    return timings
+
+
+def bench(sizes: list[int]):
+    logger.info(f"{'rows':>8}  {'query':<18} {'no index (ms)':>14} {'indexed (ms)':>13} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            engine = create_engine(f"sqlite:///{Path(tmp) / f'bench_{rows}.db'}")
+            _populate(engine, rows)
+            before = _time_queries(engine)
+
+            for index in inspect(JobListing).local_table.indexes:
+                index.create(engine)
+            with engine.begin() as connection:
+                connection.exec_driver_sql("ANALYZE")
+            after = _time_queries(engine)
+            engine.dispose()
+
+            for name in QUERIES:
+                speedup = before[name] / after[name] if after[name] else float("inf")
+                logger.info(f"{rows:>8}  {name:<18} {before[name]:>14.3f} {after[name]:>13.3f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    bench([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
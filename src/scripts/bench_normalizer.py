@@ -0,0 +1,154 @@
+"""
+Micro-benchmark for the hot normalizer functions, against the previous
+implementation (recompiling/rescanning on every call) kept here as reference.
+Both must return the same values; a failing check or a speedup close to 1x is a regression.
+
+Usage: uv run python -m src.scripts.bench_normalizer [calls]
+"""
+
+import re
+import sys
+import timeit
+import unicodedata
+from collections.abc import Callable
+from html import unescape
+from typing import Any
+
+from src.util.logger_config import get_logger
+from src.util.normalizer import (
+    COUNTRY_MAP,
+    MODALITY_MAP,
+    SENIORITY_MAP,
+    extract_modality_from_text,
+    extract_seniority_from_title,
+    html_to_markdown_basic,
+    normalize_location,
+    normalize_modality,
+    normalize_seniority,
+)
+
+logger = get_logger(__name__)
+
+DEFAULT_CALLS = 20_000
+
+TITLES = [
+    "Junior Data Engineer",
+    "Senior Manager, Data Platform",
+    "Semi-Senior Backend Developer",
+    "Lead Analytics Engineer",
+    "Data Analyst (Mid-Level)",
+    "Associate Data Scientist",
+    "Ingeniero de Datos",
+    "Staff Software Engineer",
+]
+TEXTS = [
+    "Junior Data Engineer. Trabajo 100% remoto desde cualquier parte de Chile. " * 3,
+    "Data Analyst - modalidad híbrida, 3 días en oficina. " * 3,
+    "Backend Developer, onsite in Santiago. We build data pipelines with Python and SQL. " * 3,
+    "Analytics Engineer working with dbt, Airflow and AWS on a modern data stack. " * 3,
+]
+HTML = (
+    "<p>We are <strong>hiring</strong> a data engineer&nbsp;to join us.</p>"
+    "<ul><li>Python</li><li>SQL</li><li>Airflow</li></ul><br/><p>Apply now!</p>"
+)
+RAW_VALUES = ["cl", "Chile", "remote", "Remoto", "Híbrido", "2", "Semi Senior", "jr", "", None]
+
+
+# --- Reference implementation (before precompiled patterns and caches) ---
+
+
+def _legacy_normalize_text(text: str) -> str:
+    text = text.lower().strip()
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+
+
+def _legacy_map(raw, mapping: dict[str, str]) -> str:
+    val = _legacy_normalize_text("" if raw is None else str(raw).strip())
+    return mapping.get(val, val.title()) if val else "No especificado"
+
+
+def _legacy_html_to_markdown_basic(text: str) -> str:
+    text = unescape(text)
+    replacements = {
+        r"<strong>(.*?)</strong>": r"**\1**",
+        r"<li>(.*?)</li>": r"- \1\n",
+        r"<br\s*/?>": "\n",
+        r"</p>": "\n\n",
+        r"<.*?>": "",
+    }
+    for pattern, repl in replacements.items():
+        text = re.sub(pattern, repl, text, flags=re.S)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def _legacy_extract_seniority_from_title(title: str) -> str:
+    title_lower = title.lower().strip()
+    multi_word_terms = [
+        ("senior manager", "Senior Manager"),
+        ("senior director", "Senior Director"),
+        ("senior associate", "Semi-Senior"),
+        ("semi senior", "Semi-Senior"),
+        ("semi-senior", "Semi-Senior"),
+        ("mid-level", "Mid"),
+    ]
+    for term, normalized in multi_word_terms:
+        if term in title_lower:
+            return normalized
+    single_word_terms = [
+        ("principal", "Principal"),
+        ("director", "Director"),
+        ("manager", "Manager"),
+        ("senior", "Senior"),
+        ("lead", "Lead"),
+        ("staff", "Staff"),
+        ("intermediate", "Mid"),
+        ("associate", "Junior"),
+        ("junior", "Junior"),
+        ("mid", "Mid"),
+    ]
+    for term, normalized in single_word_terms:
+        if re.search(r"\b" + re.escape(term) + r"\b", title_lower):
+            return normalized
+    return "No especificado"
+
+
+def _legacy_extract_modality_from_text(text: str) -> str:
+    text_lower = text.lower().strip()
+    for keywords, modality in [
+        (["remoto", "remote", "100% remoto", "full remote", "teletrabajo", "home office"], "Remote"),
+        (["hibrido", "híbrido", "hybrid", "semi presencial"], "Hybrid"),
+        (["presencial", "onsite", "on-site", "oficina"], "Onsite"),
+    ]:
+        if any(keyword in text_lower for keyword in keywords):
+            return modality
+    return "No especificado"
+
+
+# name -> (current, legacy, inputs); the inputs mix str and None across cases
+CASES: dict[str, tuple[Callable[[Any], Any], Callable[[Any], Any], list[Any]]] = {
+    "extract_seniority_from_title": (extract_seniority_from_title, _legacy_extract_seniority_from_title, TITLES),
+    "extract_modality_from_text": (extract_modality_from_text, _legacy_extract_modality_from_text, TEXTS),
+    "html_to_markdown_basic": (html_to_markdown_basic, _legacy_html_to_markdown_basic, [HTML]),
+    "normalize_location": (normalize_location, lambda raw: _legacy_map(raw, COUNTRY_MAP), RAW_VALUES),
+    "normalize_seniority": (normalize_seniority, lambda raw: _legacy_map(raw, SENIORITY_MAP), RAW_VALUES),
+    "normalize_modality": (normalize_modality, lambda raw: _legacy_map(raw, MODALITY_MAP), RAW_VALUES),
+}
+
+
+def bench(calls: int):
+    logger.info(f"{'function':<30} {'before (µs)':>12} {'after (µs)':>11} {'speedup':>8}")
+    for name, (current, legacy, inputs) in CASES.items():
+        for value in inputs:
+            if current(value) != legacy(value):
+                raise SystemExit(f"{name}({value!r}) changed: {current(value)!r} != {legacy(value)!r}")
+
+        rounds = max(1, calls // len(inputs))
+        before = timeit.timeit(lambda f=legacy, xs=inputs: [f(x) for x in xs], number=rounds)
+        after = timeit.timeit(lambda f=current, xs=inputs: [f(x) for x in xs], number=rounds)
+        per_call = 1e6 / (rounds * len(inputs))
+        logger.info(f"{name:<30} {before * per_call:>12.2f} {after * per_call:>11.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CALLS)
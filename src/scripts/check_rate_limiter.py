@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+from src.clients.errors import ProviderRequestError
+from src.clients.getonboard import GetOnBoardClient
+from src.models import SearchCriteria
+from src.util.http_client import HttpTransport
+from src.util.logger_config import get_logger
+from src.util.rate_limiter import TokenBucket
+
+logger = get_logger(__name__)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Local stand-in for a provider API that plays back a scripted list of status codes."""
+
+    protocol_version = "HTTP/1.1"
+    script: ClassVar[list[int]] = []
+    served: ClassVar[list[int]] = []
+
+    def do_GET(self):
+        status = StubHandler.script.pop(0) if StubHandler.script else 200
+        StubHandler.served.append(status)
+        body = json.dumps({"data": []}).encode()
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def check_token_bucket(rate: float = 20.0, capacity: int = 3, requests_count: int = 23) -> bool:
+    """``requests_count`` acquisitions from 4 threads take (requests_count - capacity) / rate seconds."""
+    bucket = TokenBucket(rate, capacity)
+    start = time.monotonic()
+    threads = [
+        threading.Thread(target=lambda: [bucket.acquire() for _ in range(requests_count // 4)]) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    expected = (requests_count // 4 * 4 - capacity) / rate
+    logger.info(f"{requests_count // 4 * 4} acquisitions in {elapsed:.2f}s (expected ~{expected:.2f}s)")
+    return expected * 0.9 <= elapsed <= expected + 0.3
+
+
+def check_retries() -> bool:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    criteria = SearchCriteria(query="Data Engineer")
+
+    try:
+        with HttpTransport() as transport:
+            client = GetOnBoardClient(transport=transport, base_url=f"http://127.0.0.1:{server.server_port}/jobs")
+            client.cache = None
+
+            # 429 (Retry-After: 1) and a 503 are retried, then the page goes through
+            StubHandler.script = [429, 503]
+            start = time.monotonic()
+            client.search_jobs(criteria, max_results=1)
+            retried = StubHandler.served == [429, 503, 200] and time.monotonic() - start >= 1
+
+            # A rejected request is raised at once, not retried nor returned as "no jobs"
+            StubHandler.script, StubHandler.served = [401], []
+            try:
+                client.search_jobs(criteria, max_results=1)
+                raised = False
+            except ProviderRequestError as e:
+                raised = e.status_code == 401 and StubHandler.served == [401]
+    finally:
+        server.shutdown()
+
+    logger.info(f"Retried 429/503: {retried}, raised 401 without retrying: {raised}")
+    return retried and raised
+
+
+def check_rate_limiter() -> bool:
+    logger.info("Testing the token bucket and the clients' retry policy")
+    if not (check_token_bucket() and check_retries()):
+        logger.error("Rate limiter check FAILED")
+        return False
+
+    logger.info("Rate limiter verified SUCCESSFULLY!")
+    return True
+
+
+if __name__ == "__main__":
+    check_rate_limiter()
@@ -0,0 +1,79 @@
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import ClassVar
+
+from src.clients.getonboard import GetOnBoardClient
+from src.models import SearchCriteria
+from src.util.http_client import HttpTransport
+from src.util.logger_config import get_logger
+from src.util.response_cache import ResponseCache
+
+logger = get_logger(__name__)
+
+ETAG = '"v1"'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Local stand-in for a provider API that answers conditional requests with 304."""
+
+    protocol_version = "HTTP/1.1"
+    statuses: ClassVar[list[int]] = []
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            StubHandler.statuses.append(304)
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        item = {"id": "1", "attributes": {"title": "Junior Data Engineer", "company": {"data": {}}}}
+        body = json.dumps({"data": [item]}).encode()
+        StubHandler.statuses.append(200)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def check_response_cache() -> bool:
+    logger.info("Testing the provider response cache against a local stub server")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    criteria = SearchCriteria(query="Data Engineer")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResponseCache(path=Path(directory) / "responses.sqlite", ttl_seconds=60)
+        try:
+            with HttpTransport() as transport:
+                client = GetOnBoardClient(
+                    transport=transport, base_url=f"http://127.0.0.1:{server.server_port}/jobs", cache=cache
+                )
+                results = [len(client.search_jobs(criteria, max_results=1)) for _ in range(3)]  # miss, hit, hit
+
+                cache.ttl_seconds = 0  # everything is stale now: revalidate with If-None-Match
+                results.append(len(client.search_jobs(criteria, max_results=1)))
+        finally:
+            server.shutdown()
+            cache.close()
+
+    logger.info(f"Server answered {StubHandler.statuses}, cache stats: {dict(cache.stats)}, results: {results}")
+    if StubHandler.statuses != [200, 304] or cache.stats["hits"] != 2 or results != [1, 1, 1, 1]:
+        logger.error("Response cache check FAILED")
+        return False
+
+    logger.info("Response cache verified SUCCESSFULLY!")
+    return True
+
+
+if __name__ == "__main__":
+    check_response_cache()
@@ -15,8 +15,9 @@ def check_notify(jobs: list[JobListing]):
     try:
         notifier = TelegramNotifier()
         logger.info(f"Sending notification for {len(jobs)} test jobs to Chat ID: {settings.TELEGRAM_CHAT_ID}")
-        notifier.notify(jobs)
-        logger.info("Notification sent successfully.")
+        deliveries = notifier.deliver(jobs)
+        delivered = sum(delivery.delivered for delivery in deliveries)
+        logger.info(f"Notification sent: {delivered}/{len(deliveries)} jobs delivered.")
 
     except Exception as e:
         logger.error(f"FAILED: {e}")
@@ -0,0 +1,67 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+from src.clients.getonboard import GetOnBoardClient
+from src.models import SearchCriteria
+from src.util.http_client import HttpTransport
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Local stand-in for a provider API: gzip JSON over HTTP/1.1 keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    connections: ClassVar[set[tuple[str, int]]] = set()
+    encodings: ClassVar[list[str]] = []
+
+    def do_GET(self):
+        StubHandler.connections.add(self.client_address)
+        StubHandler.encodings.append(self.headers.get("Accept-Encoding", ""))
+
+        body = gzip.compress(json.dumps({"data": []}).encode())
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def check_transport(requests_count: int = 5) -> bool:
+    logger.info("Testing pooled HTTP transport against a local stub server")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        with HttpTransport(pool_connections=1, pool_maxsize=1) as transport:
+            client = GetOnBoardClient(transport=transport, base_url=f"http://127.0.0.1:{server.server_port}/jobs")
+            client.cache = None  # every request has to reach the server
+            for _ in range(requests_count):
+                client.search_jobs(SearchCriteria(query="Data Engineer"))
+    finally:
+        server.shutdown()
+
+    connections = len(StubHandler.connections)
+    gzip_requested = all("gzip" in encoding for encoding in StubHandler.encodings)
+    logger.info(
+        f"{len(StubHandler.encodings)} requests over {connections} connection(s), gzip requested: {gzip_requested}"
+    )
+
+    if connections != 1 or not gzip_requested:
+        logger.error("Transport check FAILED")
+        return False
+
+    logger.info("Transport verified SUCCESSFULLY!")
+    return True
+
+
+if __name__ == "__main__":
+    check_transport()
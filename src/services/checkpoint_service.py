@@ -0,0 +1,127 @@
+"""
+Incremental fetching: per source and query high-water marks, stored in the database.
+
+A ``FetchCheckpoint`` remembers the newest ``posted_date`` seen and the most recent
+listing IDs. The next run of the same query:
+  - asks the provider only for listings posted since then (``posted_after``, which
+    the clients turn into their own date filter, minus CHECKPOINT_OVERLAP_HOURS for
+    listings indexed late),
+  - stops paginating at the first page made only of known or older listings, and
+  - drops the known listings of the pages it does read before they reach the pipeline.
+
+The checkpoint is advanced with ``save_checkpoint`` once the run's listings are
+stored, so a run that fails half way is read again in full next time.
+"""
+
+import hashlib
+import json
+from collections.abc import AsyncIterator, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session
+
+from src.clients.base import BaseJobClient
+from src.config import settings
+from src.models import FetchCheckpoint, JobListing, SearchCriteria
+from src.services import storage_service
+from src.util.logger_config import get_logger
+from src.util.normalizer import parse_datetime
+
+logger = get_logger(__name__)
+
+
+class RunState:
+    """What one run of a query has read so far, to be folded into its checkpoint."""
+
+    def __init__(self, checkpoint: FetchCheckpoint):
+        self.checkpoint = checkpoint
+        self.known = frozenset(checkpoint.seen_ids) if settings.INCREMENTAL_FETCH else frozenset()
+        self.seen_ids: list[str] = []
+        self.last_posted_at = parse_datetime(checkpoint.last_posted_at)
+        self.skipped = 0
+
+    def fetch_options(self) -> dict[str, Any]:
+        """``known_ids``/``posted_after`` for the client's ``iter_jobs``/``aiter_pages``."""
+        options: dict[str, Any] = {}
+        if self.known:
+            options["known_ids"] = self.known
+        if settings.INCREMENTAL_FETCH and self.last_posted_at is not None:
+            options["posted_after"] = self.last_posted_at - timedelta(hours=settings.CHECKPOINT_OVERLAP_HOURS)
+        return options
+
+    def track(self, jobs: list[JobListing]) -> list[JobListing]:
+        """Records ``jobs`` and returns the ones the checkpoint didn't know yet."""
+        fresh = []
+        now = datetime.now(UTC)
+        for job in jobs:
+            self.seen_ids.append(job.id)
+            # A date in the future (bad provider data) would hide everything posted until then
+            posted = parse_datetime(job.posted_date)
+            if posted is not None and (self.last_posted_at is None or posted > self.last_posted_at):
+                self.last_posted_at = min(posted, now)
+            if job.id in self.known:
+                self.skipped += 1
+            else:
+                fresh.append(job)
+        return fresh
+
+
+def query_key(criteria: SearchCriteria) -> str:
+    """Identifies a query; the date window is left out, as the checkpoint replaces it."""
+    fields = criteria.model_dump(mode="json", exclude={"date_posted"})
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def load_checkpoint(source: str, criteria: SearchCriteria, key: str | None = None) -> RunState:
+    """The checkpoint of ``criteria`` (or of ``key``, e.g. the provider request it maps to)."""
+    key = key or query_key(criteria)
+    with Session(storage_service.engine) as session:
+        checkpoint = session.get(FetchCheckpoint, (source, key))
+    if checkpoint is None:
+        checkpoint = FetchCheckpoint(source=source, query_key=key, query=criteria.model_dump_json(exclude_none=True))
+    return RunState(checkpoint)
+
+
+def save_checkpoint(state: RunState):
+    """Advances the checkpoint past what the run read: call it once the listings are saved."""
+    checkpoint = state.checkpoint
+    seen_ids = list(dict.fromkeys(state.seen_ids + checkpoint.seen_ids))[: settings.CHECKPOINT_MAX_IDS]
+    values = {
+        "source": checkpoint.source,
+        "query_key": checkpoint.query_key,
+        "query": checkpoint.query,
+        "last_posted_at": state.last_posted_at,
+        "seen_ids": seen_ids,
+        "fetched": len(state.seen_ids),
+        "updated_at": datetime.now(UTC),
+    }
+    statement = (
+        sqlite_insert(FetchCheckpoint)
+        .values(values)
+        .on_conflict_do_update(index_elements=["source", "query_key"], set_=values)
+    )
+    with storage_service.engine.begin() as connection:
+        connection.execute(statement)
+    logger.info(
+        f"{checkpoint.source}: checkpoint at {state.last_posted_at or 'no date'}, "
+        f"{len(state.seen_ids)} listings read, {state.skipped} already known"
+    )
+
+
+def iter_new_jobs(
+    client: BaseJobClient, criteria: SearchCriteria, state: RunState, **options: Any
+) -> Iterator[JobListing]:
+    """``client.iter_jobs`` limited to what the checkpoint in ``state`` hasn't seen."""
+    for job in client.iter_jobs(criteria, **state.fetch_options(), **options):
+        yield from state.track([job])
+
+
+async def aiter_new_pages(
+    client: BaseJobClient, criteria: SearchCriteria, state: RunState, **options: Any
+) -> AsyncIterator[list[JobListing]]:
+    """``client.aiter_pages`` limited to what the checkpoint in ``state`` hasn't seen."""
+    async for page in client.aiter_pages(criteria, **state.fetch_options(), **options):
+        if fresh := state.track(page):
+            yield fresh
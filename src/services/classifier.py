@@ -0,0 +1,62 @@
+"""
+One-scan classification of a listing's text.
+
+Lower-cases the title, description and company name once and derives from them
+the seniority, the modality and the filter rule hits, so the normaliser and the
+filter no longer read (and lower-case) the same description separately.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+from src.models import JobListing
+from src.services.rule_engine import TEXT_FIELDS, Evaluation, Facts, TermKey, get_rule_engine
+from src.util.normalizer import match_modality, match_seniority
+
+
+class Classification(NamedTuple):
+    seniority: str
+    modality: str
+    hits: frozenset[TermKey]  # rule engine term hits, see RuleEngine.scan
+
+
+def classify(job: JobListing) -> Classification:
+    """
+    Classification of ``job``, cached on the listing: it is recomputed only if one of
+    the text fields changed since the last call.
+    """
+    source = tuple(getattr(job, field) for field in TEXT_FIELDS)
+    # Stored in the instance dict directly: a missing attribute on a SQLModel goes
+    # through pydantic's __getattr__, which costs more than the lookup it saves
+    cached = vars(job).get("_classification")
+    if cached is not None and cached[0] == source:
+        return cached[1]
+
+    texts = {field: (value or "").lower() for field, value in zip(TEXT_FIELDS, source, strict=True)}
+    classification = Classification(
+        seniority=match_seniority(texts["title"]),
+        modality=match_modality(texts["title"], texts["description"]),
+        hits=get_rule_engine().scan_lowered(texts),
+    )
+    vars(job)["_classification"] = (source, classification)
+    return classification
+
+
+def evaluate_job(job: JobListing, profiles: Iterable[str] = ("default",)) -> dict[str, Evaluation]:
+    """``RuleEngine.evaluate_job`` on the cached classification instead of a fresh scan."""
+    hits = classify(job).hits
+    facts = Facts(job.salary, job.seniority, job.modality)
+    engine = get_rule_engine()
+    return {profile: engine.evaluate(hits, facts, profile) for profile in profiles}
+
+
+def classify_jobs(jobs: Iterable[JobListing]) -> Iterator[JobListing]:
+    """Generator stage that fills the seniority and modality providers didn't send."""
+    for job in jobs:
+        if job.seniority is None or job.modality is None:
+            classification = classify(job)
+            if job.seniority is None:
+                job.seniority = classification.seniority
+            if job.modality is None:
+                job.modality = classification.modality
+        yield job
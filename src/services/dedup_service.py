@@ -0,0 +1,156 @@
+"""
+Cross-source near-duplicate detection.
+
+Every saved listing gets a MinHash signature over its normalised title, company and
+location (plus, optionally, the first words of its description), stored in
+``JobFingerprint``, and one ``LshBucket`` row per LSH band. An incoming listing is
+checked against the whole history with a single indexed ``bucket IN (...)`` lookup
+and a signature comparison against the few candidates it returns. A candidate only
+counts if it comes from another source and its title alone is close enough too:
+company and location shingles would otherwise match two roles of the same employer.
+"""
+
+import re
+import unicodedata
+from collections.abc import Iterable, Sequence
+from functools import cache
+from itertools import batched, pairwise
+
+from sqlalchemy import Connection
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import col, select
+
+from src.config import settings
+from src.models import JobFingerprint, JobListing, LshBucket
+from src.util.logger_config import get_logger
+from src.util.minhash import MinHasher
+
+logger = get_logger(__name__)
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Keeps every statement under SQLite's bound-parameter limit (32766)
+KEYS_PER_STATEMENT = 30000
+
+# Legal suffixes that vary between providers for the same employer
+COMPANY_STOPWORDS = {"inc", "llc", "ltd", "ltda", "spa", "sa", "s", "a", "corp", "co", "gmbh", "the"}
+
+
+@cache
+def get_hasher() -> MinHasher:
+    return MinHasher(num_perm=settings.DEDUP_NUM_PERM, bands=settings.DEDUP_BANDS)
+
+
+def _words(text: str | None) -> list[str]:
+    """Lower-cased, accent-free words."""
+    text = unicodedata.normalize("NFKD", (text or "").lower()).encode("ascii", "ignore").decode()
+    return WORD_RE.findall(text)
+
+
+def shingles(job: JobListing) -> set[str]:
+    """Features compared between listings, prefixed by the field they come from."""
+    title = _words(job.title)
+    company = [word for word in _words(job.company_name) if word not in COMPANY_STOPWORDS]
+
+    features = {f"t:{word}" for word in title}
+    features.update(f"t:{a} {b}" for a, b in pairwise(title))
+    features.update(f"c:{word}" for word in company)
+    features.update(f"l:{word}" for word in _words(job.location))
+
+    if settings.DEDUP_DESCRIPTION_WORDS:
+        description = _words(job.description)[: settings.DEDUP_DESCRIPTION_WORDS]
+        features.update(f"d:{' '.join(description[i : i + 3])}" for i in range(len(description) - 2))
+    return features
+
+
+def fingerprint(job: JobListing) -> list[int]:
+    return get_hasher().signature(shingles(job))
+
+
+def title_similarity(a: str | None, b: str | None) -> float:
+    """Jaccard similarity of the two titles' words."""
+    words_a, words_b = set(_words(a)), set(_words(b))
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+def find_near_duplicates(connection: Connection, jobs: Sequence[JobListing]) -> dict[str, str]:
+    """
+    Maps the ID of every listing in ``jobs`` that near-duplicates an already stored
+    listing, or an earlier listing of the same batch, from another source, to the ID
+    it duplicates.
+
+    A listing is never reported as a duplicate of its own ID: re-fetching the same
+    listing is left to the primary key.
+    """
+    hasher = get_hasher()
+    signatures = {job.id: fingerprint(job) for job in jobs}
+    band_keys = {job_id: hasher.band_keys(signature) for job_id, signature in signatures.items()}
+
+    # 1. One indexed lookup for every bucket of the batch
+    all_keys = {key for keys in band_keys.values() for key in keys}
+    stored_buckets: dict[int, list[str]] = {}
+    for chunk in batched(all_keys, KEYS_PER_STATEMENT, strict=False):
+        statement = select(LshBucket.bucket, LshBucket.job_id).where(col(LshBucket.bucket).in_(chunk))
+        for bucket, job_id in connection.execute(statement):
+            stored_buckets.setdefault(bucket, []).append(job_id)
+
+    candidate_ids = {job_id for ids in stored_buckets.values() for job_id in ids} - signatures.keys()
+    stored: dict[str, tuple[list[int], str, str]] = {}  # job ID -> (signature, source, title)
+    for chunk in batched(candidate_ids, KEYS_PER_STATEMENT, strict=False):
+        statement = (
+            select(JobFingerprint.job_id, JobFingerprint.signature, JobListing.source, JobListing.title)
+            .join(JobListing, col(JobListing.id) == col(JobFingerprint.job_id))
+            .where(col(JobFingerprint.job_id).in_(chunk))
+        )
+        for job_id, signature, source, title in connection.execute(statement):
+            stored[job_id] = (signature, source, title)
+    batch = {job.id: (signatures[job.id], job.source, job.title) for job in jobs}
+
+    # 2. Verify candidates on the signatures; earlier listings of the batch are candidates too
+    duplicates: dict[str, str] = {}
+    batch_buckets: dict[int, list[str]] = {}
+    for job in jobs:
+        signature = signatures[job.id]
+        candidates = dict.fromkeys(
+            job_id
+            for key in band_keys[job.id]
+            for job_id in (*stored_buckets.get(key, ()), *batch_buckets.get(key, ()))
+            if job_id != job.id
+        )
+        for candidate in candidates:
+            other = stored.get(candidate) or batch.get(candidate)
+            if other is None:
+                continue
+            other_signature, other_source, other_title = other
+            if (
+                other_source != job.source
+                and other_signature
+                and hasher.similarity(signature, other_signature) >= settings.DEDUP_THRESHOLD
+                and title_similarity(job.title, other_title) >= settings.DEDUP_TITLE_THRESHOLD
+            ):
+                duplicates[job.id] = candidate
+                break
+        else:
+            for key in band_keys[job.id]:
+                batch_buckets.setdefault(key, []).append(job.id)
+
+    return duplicates
+
+
+def index_jobs(connection: Connection, jobs: Iterable[JobListing]):
+    """Stores the signature and LSH buckets of listings that were just saved."""
+    hasher = get_hasher()
+    fingerprints, buckets = [], []
+    for job in jobs:
+        signature = fingerprint(job)
+        if not signature:
+            continue
+        fingerprints.append({"job_id": job.id, "signature": signature})
+        buckets.extend({"bucket": key, "job_id": job.id} for key in hasher.band_keys(signature))
+
+    for chunk in batched(fingerprints, KEYS_PER_STATEMENT // 2, strict=False):
+        connection.execute(sqlite_insert(JobFingerprint).values(chunk).on_conflict_do_nothing())
+    for chunk in batched(buckets, KEYS_PER_STATEMENT // 2, strict=False):
+        connection.execute(sqlite_insert(LshBucket).values(chunk).on_conflict_do_nothing())
@@ -0,0 +1,83 @@
+from collections import Counter
+
+from sqlmodel import col
+
+from src.config import settings
+from src.models import JobListing, OutboxMessage
+from src.services import outbox_service, storage_service
+from src.services.notifier import TelegramNotifier
+from src.services.storage_service import iter_jobs, mark_jobs_as_notified
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def drain_outbox(
+    notifier: TelegramNotifier | None = None, batch_size: int = settings.OUTBOX_BATCH_SIZE
+) -> dict[str, int]:
+    """
+    Delivers the queued notifications, ``batch_size`` messages per round, until none
+    is due. Independent from fetching: run it after the scouts or on its own schedule.
+    With NOTIFY_TOP_K a chat gets one digest per drain, of the best NOTIFY_TOP_K of
+    all its due listings; the rest wait for the next drain.
+    """
+    notifier = notifier or TelegramNotifier()
+    stats: Counter[str] = Counter()
+    if not notifier.configured:
+        logger.warning("Telegram configuration missing. Leaving the outbox untouched.")
+        return dict(stats)
+
+    served: set[str] = set()  # chats already given their NOTIFY_TOP_K this drain
+    while True:
+        with storage_service.engine.begin() as connection:
+            token, messages = outbox_service.claim(connection, batch_size, served, settings.NOTIFY_TOP_K)
+        if not messages:
+            break
+        if settings.NOTIFY_TOP_K:
+            served.update(message.chat_id for message in messages)
+
+        errors, permanent = _deliver(notifier, messages)
+        with storage_service.engine.begin() as connection:
+            outbox_service.record(connection, token, messages, errors, permanent)
+
+        sent = [message.job_id for message in messages if message.id in errors and errors[message.id] is None]
+        if sent:
+            mark_jobs_as_notified(sent)
+        stats["claimed"] += len(messages)
+        stats["sent"] += len(sent)
+        stats["failed"] += sum(error is not None for error in errors.values())
+        if not sent:
+            break  # nothing got through this round: leave the rest to the next drain
+
+    logger.info(f"Outbox drained: {dict(stats)}")
+    return dict(stats)
+
+
+def _deliver(notifier: TelegramNotifier, messages: list[OutboxMessage]) -> tuple[dict[str, str | None], set[str]]:
+    """
+    Sends one digest per chat, the chats concurrently. Maps each message ID to None
+    (delivered) or its error, and returns the IDs of the failures retrying can't fix.
+    """
+    jobs = {job.id: job for job in iter_jobs(col(JobListing.id).in_({message.job_id for message in messages}))}
+    errors: dict[str, str | None] = {}
+    permanent: set[str] = set()
+
+    chats: dict[str, list[OutboxMessage]] = {}
+    for message in messages:
+        if message.job_id in jobs:
+            chats.setdefault(message.chat_id, []).append(message)
+        else:
+            errors[message.id] = "listing not found"
+            permanent.add(message.id)
+
+    deliveries = notifier.deliver_to(
+        {chat_id: [jobs[message.job_id] for message in chat_messages] for chat_id, chat_messages in chats.items()}
+    )
+    for chat_id, chat_messages in chats.items():
+        by_job = {delivery.job_id: delivery for delivery in deliveries.get(chat_id, [])}
+        for message in chat_messages:
+            if delivery := by_job.get(message.job_id):
+                errors[message.id] = None if delivery.delivered else (delivery.error or "not delivered")
+                if not delivery.delivered and not delivery.retryable:
+                    permanent.add(message.id)
+    return errors, permanent
@@ -1,94 +1,71 @@
 # src/services/filter_service.py
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, NamedTuple
+
 from src.models import JobListing
+from src.services.classifier import evaluate_job
+from src.services.rule_engine import FACT_FIELDS, TEXT_FIELDS, Evaluation, Facts, get_rule_engine
 from src.util.logger_config import get_logger
 
 logger = get_logger(__name__)
 
 
-class FilterService:
-    # 1. Palabras que SÍ o SÍ queremos (si la lista está vacía, trae todo lo que no esté excluido)
-    TARGET_KEYWORDS = [
-        # Seniority
-        "junior",
-        "jr",
-        "trainee",
-        "semisenior",
-        "semi senior",
-        "ssr",
-        "early career",
-        # Roles
-        "data engineer",
-        "ingeniero de datos",
-        "backend",
-        "data scientist",
-        "analytics engineer",
-        "data analyst",
-        "analista de datos",
-        "data analytics",
-        # Core Stack
-        "python",
-        "sql",
-        "postgresql",
-        # Orquestación y ML
-        "xgboost",
-        "prefect",
-        "airflow",
-        "dagster",
-        # Herramientas Pro
-        "dbt",
-        "aws",
-        "docker",
-        "pyspark",
-        "pandas",
-    ]
-    # 2. Palabras que NO queremos bajo ningún concepto
-    EXCLUDED_KEYWORDS = [
-        "senior",
-        "sr.",
-        "lead",
-        "principal",
-        "architect",
-        "manager",
-        "experto",
-    ]
+class FilterMask(NamedTuple):
+    mask: list[bool]  # True si la fila pasa el filtro
+    matches: list[frozenset[str]]  # keywords encontradas en cada fila
 
-    # 3. Excepciones: Si aparece una palabra excluida (ej: "Senior"),
-    # pero está dentro de esta frase (ej: "Semi Senior"), la perdonamos.
-    EXCEPTION_KEYWORDS = ["semi senior", "semi-senior", "semisenior"]
+
+class FilterService:
+    # Las reglas (keywords objetivo, excluidas y excepciones) viven en src/filter_rules.toml;
+    # cada perfil de ese archivo es un filtro distinto.
 
     @staticmethod
-    def filter_jobs(jobs: list[JobListing]) -> list[JobListing]:
-        filtered = []
+    def filter_jobs(jobs: list[JobListing], profile: str = "default") -> list[JobListing]:
         logger.info(f"Filtrando {len(jobs)} ofertas...")
+        filtered = list(FilterService.iter_filter(jobs, profile))
+        logger.info(f"Filtro completado: {len(filtered)} ofertas seleccionadas de {len(jobs)}.")
+        return filtered
 
-        for job in jobs:
-            # Normalizamos todo el texto relevante a minúsculas para buscar fácil
-            text_content = (f"{job.title} {job.description or ''} {job.company_name}").lower()
-
-            # --- PASO A: Verificar Exclusiones ---
-            is_excluded = False
-            for bad_word in FilterService.EXCLUDED_KEYWORDS:
-                if bad_word in text_content:
-                    # ¡ALERTA! Encontramos una palabra prohibida.
-                    # Pero antes de descartar, chequeamos si es una excepción (ej: "Semi Senior")
-                    is_safe_exception = any(exc in text_content for exc in FilterService.EXCEPTION_KEYWORDS)
-
-                    if not is_safe_exception:
-                        is_excluded = True
-                        break  # Ya está excluida, no busques más
+    @staticmethod
+    def iter_filter(jobs: Iterable[JobListing], profile: str = "default") -> Iterator[JobListing]:
+        """Versión generador de filter_jobs: deja pasar las ofertas una a una, sin armar listas."""
+        for job, _ in FilterService.iter_matches(jobs, profile):
+            yield job
 
-            if is_excluded:
-                continue  # Saltamos a la siguiente oferta
+    @staticmethod
+    def iter_matches(jobs: Iterable[JobListing], profile: str = "default") -> Iterator[tuple[JobListing, Evaluation]]:
+        """Como iter_filter, pero junto a cada oferta entrega su evaluación (reglas, keywords y puntaje)."""
+        for job in jobs:
+            # Usa la clasificación cacheada en la oferta: el texto no se vuelve a escanear
+            evaluation = evaluate_job(job, [profile])[profile]
+            if evaluation.accepted:
+                yield job, evaluation
 
-            # --- PASO B: Verificar Inclusiones (Match) ---
-            # Si no definiste keywords objetivo, asumimos que quieres todo lo que pasó el filtro de exclusión.
-            if not FilterService.TARGET_KEYWORDS:
-                filtered.append(job)
-                continue
+    @staticmethod
+    def filter_batch(jobs: Sequence[JobListing], profile: str = "default") -> list[JobListing]:
+        """Igual que filter_jobs, pero evaluando todas las ofertas juntas con filter_columns."""
+        columns = {field: [getattr(job, field) for job in jobs] for field in TEXT_FIELDS + FACT_FIELDS}
+        result = FilterService.filter_columns(columns, profile)
+        return [job for job, keep in zip(jobs, result.mask, strict=True) if keep]
 
-            # Si definiste keywords, al menos una debe estar presente
-            if any(target in text_content for target in FilterService.TARGET_KEYWORDS):
-                filtered.append(job)
+    @staticmethod
+    def filter_columns(columns: Mapping[str, Sequence[Any]], profile: str = "default") -> FilterMask:
+        """
+        Modo batch para backfills: aplica las mismas reglas que iter_filter sobre columnas
+        completas (campo de JobListing -> un valor por oferta). Cada columna se tokeniza
+        de una vez y el escaneo entrega, por término, el conjunto de filas donde aparece;
+        luego cada regla se evalúa con operaciones de conjuntos sobre esas filas, no fila
+        por fila. Los términos por palabra se siguen buscando fila a fila (ver
+        PhraseMatcher.find_rows), así que la ganancia frente a iter_filter es acotada:
+        src/scripts/bench_filter.py la mide.
+        """
+        rows = max((len(column) for column in columns.values()), default=0)
+        engine = get_rule_engine()
+        hits = engine.scan_columns(columns, rows)
 
-        logger.info(f"Filtro completado: {len(filtered)} ofertas seleccionadas de {len(jobs)}.")
-        return filtered
+        facts = [
+            Facts(*values)
+            for values in zip(*(columns.get(field) or [None] * rows for field in FACT_FIELDS), strict=True)
+        ]
+        mask, matches = engine.evaluate_columns(hits, facts, profile)
+        return FilterMask(mask=mask, matches=matches)
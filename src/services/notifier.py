@@ -1,57 +1,358 @@
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any, NamedTuple
+
+import httpx
 import requests
 
+from src.clients.errors import parse_retry_after
 from src.config import settings
 from src.models import JobListing
+from src.services.scoring_service import ScoringService
+from src.util.html_markdown import listing_markdown
+from src.util.http_client import AsyncHttpTransport, HttpTransport, get_async_transport, get_transport
 from src.util.logger_config import get_logger
-from src.util.normalizer import html_to_markdown_basic
+from src.util.rate_limiter import TokenBucket, backoff_delay, get_rate_limiter
 
 logger = get_logger(__name__)
 
+ELLIPSIS = "…"
+DIGEST_SEPARATOR = "\n\n"
+
+# Characters that open an entity in Telegram's (legacy) Markdown; a backslash makes them literal
+MARKDOWN_ESCAPES = str.maketrans({char: f"\\{char}" for char in "_*`["})
+# An escape or a whole entity: a cut must fall before or after these, never inside
+MARKDOWN_ENTITY_RE = re.compile(r"\\[_*`\[]|\[[^\]]*\]\([^)]*\)|```.*?```|`[^`]*`|\*[^*]*\*|_[^_]*_", re.DOTALL)
+
+
+class Digest(NamedTuple):
+    """
+    One Telegram message and the listings it carries (``blocks``: each listing's own
+    text; ``header``: the text opening the message before them, if any).
+    """
+
+    chat_id: str
+    text: str
+    job_ids: tuple[str, ...] = ()
+    blocks: tuple[str, ...] = ()
+    header: str = ""
+
+    def split(self) -> list["Digest"]:
+        """One message per listing, after the header on its own."""
+        singles = [
+            Digest(self.chat_id, block, (job_id,), (block,))
+            for job_id, block in zip(self.job_ids, self.blocks, strict=True)
+        ]
+        return [Digest(self.chat_id, self.header), *singles] if self.header else singles
+
+
+class SendError(NamedTuple):
+    error: str
+    retryable: bool  # 429, 5xx or a network error: the same message may go through later
+
+
+class Delivery(NamedTuple):
+    job_id: str
+    delivered: bool
+    error: str | None = None
+    retryable: bool = True
+
+
+def escape_markdown(text: str) -> str:
+    """``text`` shown as is in a Markdown message."""
+    return text.translate(MARKDOWN_ESCAPES)
+
+
+def truncate_markdown(text: str, limit: int) -> str:
+    """
+    ``text`` cut to ``limit`` characters (ellipsis included), moved back so the cut
+    doesn't split an escape or an entity: Telegram rejects a message left with one open.
+    """
+    if len(text) <= limit:
+        return text
+    end = limit - len(ELLIPSIS)
+    for match in MARKDOWN_ENTITY_RE.finditer(text):
+        if match.start() >= end:
+            break
+        if match.end() > end:
+            end = match.start()
+            break
+    return text[:end].rstrip() + ELLIPSIS
+
+
+def pack_digests(
+    chat_id: str,
+    header: str,
+    blocks: Sequence[tuple[str, str]],
+    limit: int = settings.TELEGRAM_MESSAGE_LIMIT,
+) -> list[Digest]:
+    """
+    Packs (job ID, formatted listing) blocks, in order, into as few messages of at most
+    ``limit`` characters as possible, the header opening the first one. A block that
+    doesn't fit in a message on its own is cut (see ``truncate_markdown``).
+    """
+    digests: list[Digest] = []
+    opening = header.rstrip()
+    text, job_ids, packed = opening, [], []
+    for job_id, block in blocks:
+        block = truncate_markdown(block, limit)
+        if text and len(text) + len(DIGEST_SEPARATOR) + len(block) > limit:
+            digests.append(Digest(chat_id, text, tuple(job_ids), tuple(packed), opening))
+            text, job_ids, packed, opening = "", [], [], ""
+        text = f"{text}{DIGEST_SEPARATOR}{block}" if text else block
+        job_ids.append(job_id)
+        packed.append(block)
+    if text:
+        digests.append(Digest(chat_id, text, tuple(job_ids), tuple(packed), opening))
+    return digests
+
 
 class TelegramNotifier:
-    def __init__(self):
+    """
+    Sends listings as digests: as many formatted listings per message as fit in
+    Telegram's 4096 characters, best scored first.
+
+    Digests go out through a pool of TELEGRAM_WORKERS workers (``deliver_to`` serves
+    many chats at once), one chat per worker at a time so a chat's messages keep
+    their order, throttled by a bucket per chat (the TELEGRAM_CHAT_BUCKETS most
+    recently used are kept) and one for the whole bot. A 429
+    pauses the chat for its ``retry_after`` and the message is retried; a digest
+    rejected outright (another 4xx) is sent again one listing per message, its header
+    first, so only the offending listing fails. Each listing ends up with a ``Delivery`` result.
+    """
+
+    API_URL = "https://api.telegram.org"
+
+    def __init__(
+        self,
+        transport: HttpTransport | None = None,
+        api_url: str | None = None,
+        async_transport: AsyncHttpTransport | None = None,
+    ):
+        self.transport = transport or get_transport()
+        self.async_transport = async_transport
         self.token = settings.TELEGRAM_BOT_TOKEN
         self.chat_id = settings.TELEGRAM_CHAT_ID
+        self._chat_buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._chat_buckets_lock = threading.Lock()
         if self.token:
-            self.base_url = f"https://api.telegram.org/bot{self.token.get_secret_value()}/sendMessage"
+            self.base_url = f"{api_url or self.API_URL}/bot{self.token.get_secret_value()}/sendMessage"
         else:
             self.base_url = None
 
-    def notify(self, jobs: list[JobListing]):
-        if not self.base_url or not self.chat_id:
-            logger.warning("Telegram configuration missing. Skipping notification.")
-            return
+    @property
+    def configured(self) -> bool:
+        """Whether messages can be sent; the chat may come with each call instead of TELEGRAM_CHAT_ID."""
+        return bool(self.base_url)
+
+    def notify(self, jobs: list[JobListing]) -> list[str]:
+        """Sends the jobs and returns the IDs of the ones actually delivered."""
+        return [delivery.job_id for delivery in self.deliver(jobs) if delivery.delivered]
+
+    async def anotify(self, jobs: list[JobListing]) -> list[str]:
+        """Sends the jobs and returns the IDs of the ones actually delivered."""
+        return [delivery.job_id for delivery in await self.adeliver(jobs) if delivery.delivered]
+
+    def deliver(self, jobs: list[JobListing], chat_id: str | None = None) -> list[Delivery]:
+        """Sends the jobs to ``chat_id`` (default TELEGRAM_CHAT_ID), one result per listing."""
+        chat_id = chat_id or self.chat_id or ""
+        return self.deliver_to({chat_id: jobs}).get(chat_id, [])
+
+    async def adeliver(self, jobs: list[JobListing], chat_id: str | None = None) -> list[Delivery]:
+        chat_id = chat_id or self.chat_id or ""
+        return (await self.adeliver_to({chat_id: jobs})).get(chat_id, [])
+
+    def deliver_to(self, jobs_by_chat: Mapping[str, list[JobListing]]) -> dict[str, list[Delivery]]:
+        """
+        Sends each chat its own digest (chat ID -> listings), all chats through the
+        same worker pool. Returns each chat's results, one per listing.
+        """
+        chats = self._digests_by_chat(jobs_by_chat)
+        with ThreadPoolExecutor(max_workers=settings.TELEGRAM_WORKERS) as executor:
+            results = list(executor.map(self._send_chat, chats.values()))
+        return self._deliveries(chats, results)
 
+    async def adeliver_to(self, jobs_by_chat: Mapping[str, list[JobListing]]) -> dict[str, list[Delivery]]:
+        chats = self._digests_by_chat(jobs_by_chat)
+        workers = asyncio.Semaphore(settings.TELEGRAM_WORKERS)
+
+        async def send_chat(chat: list[Digest]) -> list[Delivery]:
+            async with workers:
+                return [delivery for digest in chat for delivery in await self._asend_digest(digest)]
+
+        results = await asyncio.gather(*(send_chat(chat) for chat in chats.values()))
+        return self._deliveries(chats, results)
+
+    def _digests_by_chat(self, jobs_by_chat: Mapping[str, list[JobListing]]) -> dict[str, list[Digest]]:
+        """Each chat's messages, in order; chats that can't be sent to are left out."""
+        chats = {}
+        for chat_id, jobs in jobs_by_chat.items():
+            digests = self._digests(jobs, chat_id)
+            if digests:
+                chats[chat_id] = digests
+        logger.info(f"Sending {sum(map(len, chats.values()))} messages to {len(chats)} chats")
+        return chats
+
+    def _digests(self, jobs: list[JobListing], chat_id: str | None = None) -> list[Digest] | None:
+        """The messages to send for ``jobs``; None if Telegram isn't configured."""
+        chat_id = chat_id or self.chat_id
+        if not self.base_url or not chat_id:
+            logger.warning("Telegram configuration missing. Skipping notification.")
+            return None
         if not jobs:
-            self._send_message("No new jobs found matching your criteria.")
-            return
-
-        header = f"🚀 Found {len(jobs)} new jobs!\n\n"
-        self._send_message(header)
-
-        for job in jobs[:10]:  # Limit to 10 notifications to avoid spam
-            msg = (
-                f"**{job.title}**\n"
-                f"Modality: {job.modality}\n"
-                f"📍 {job.location or 'Unknown'}\n"
-                f"🔗 [Apply Here]({job.url})\n"
-                f"🏷️ {', '.join(job.tags)}\n"
-                f"{html_to_markdown_basic(job.description)}"
-            )
-            self._send_message(msg)
-
-    def _send_message(self, text: str):
-        if not self.base_url or not self.chat_id:
-            logger.warning("Cannot send message: Missing Telegram config.")
-            return
-
-        payload = {
-            "chat_id": self.chat_id,
+            return [Digest(chat_id, "No new jobs found matching your criteria.")]
+
+        ranked = ScoringService.top_k(jobs, settings.NOTIFY_TOP_K or len(jobs))
+        if len(ranked) < len(jobs):
+            logger.info(f"Notifying the best {len(ranked)} of {len(jobs)} jobs (NOTIFY_TOP_K)")
+        digests = pack_digests(chat_id, self._header(jobs), [(job.id, self._format_job(job)) for job in ranked])
+        logger.debug(f"Packed {len(ranked)} jobs into {len(digests)} messages for chat {chat_id}")
+        return digests
+
+    @staticmethod
+    def _deliveries(chats: dict[str, list[Digest]], results: list[list[Delivery]]) -> dict[str, list[Delivery]]:
+        """Each chat's results, one per listing."""
+        deliveries = dict(zip(chats, results, strict=True))
+        failed = sum(not delivery.delivered for chat in deliveries.values() for delivery in chat)
+        if failed:
+            total = sum(map(len, deliveries.values()))
+            logger.warning(f"{failed} of {total} jobs could not be delivered")
+        return deliveries
+
+    def _header(self, jobs: list[JobListing]) -> str:
+        return f"🚀 Found {len(jobs)} new jobs!\n\n"
+
+    def _format_job(self, job: JobListing) -> str:
+        # Provider text is escaped, so only the entities written here reach Telegram. Legacy
+        # Markdown bold is a single *; it reads the preview's ** as empty bold, so they are dropped.
+        preview = listing_markdown(job, settings.NOTIFY_PREVIEW_CHARS).replace("**", "")
+        return (
+            f"*{escape_markdown(job.title)}*\n"
+            f"Modality: {escape_markdown(str(job.modality))}\n"
+            f"📍 {escape_markdown(job.location or 'Unknown')}\n"
+            f"🔗 [Apply Here]({job.url})\n"
+            f"🏷️ {escape_markdown(', '.join(job.tags))}\n"
+            f"{escape_markdown(preview)}"
+        )
+
+    def _payload(self, text: str, chat_id: str | None = None) -> dict[str, Any]:
+        return {
+            "chat_id": chat_id or self.chat_id,
             "text": text,
             "parse_mode": "Markdown",
         }
-        try:
-            response = requests.post(self.base_url, json=payload)
-            response.raise_for_status()
-        except Exception as e:
-            logger.error(f"Error sending Telegram notification: {e}")
+
+    # --- Sending: one message, throttled and retried ---
+
+    def _buckets(self, chat_id: str) -> tuple[TokenBucket, TokenBucket]:
+        return (
+            get_rate_limiter("Telegram", settings.TELEGRAM_GLOBAL_RATE, int(settings.TELEGRAM_GLOBAL_RATE)),
+            self._chat_bucket(chat_id),
+        )
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        # An evicted chat was idle long enough for its bucket to be full again, so a new one is equivalent
+        with self._chat_buckets_lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                bucket = self._chat_buckets[chat_id] = TokenBucket(
+                    settings.TELEGRAM_CHAT_RATE, settings.TELEGRAM_CHAT_BURST
+                )
+                if len(self._chat_buckets) > settings.TELEGRAM_CHAT_BUCKETS:
+                    self._chat_buckets.popitem(last=False)
+            else:
+                self._chat_buckets.move_to_end(chat_id)
+            return bucket
+
+    @staticmethod
+    def _failure(response: requests.Response | httpx.Response) -> tuple[str, bool, float | None]:
+        """(error, whether to retry, retry_after) for a non-200 answer: only 429s and 5xx are retried."""
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        with suppress(ValueError, KeyError, TypeError):  # Telegram puts it in the body
+            retry_after = float(response.json()["parameters"]["retry_after"])
+        status = response.status_code or 0  # requests types it Optional; a received response always has one
+        return f"HTTP {status}: {response.text[:200]}", status == 429 or status >= 500, retry_after
+
+    def _retry_delay(self, chat_id: str, error: str, attempt: int, retry_after: float | None) -> float:
+        if retry_after is not None:
+            self._buckets(chat_id)[1].pause(retry_after)
+        delay = backoff_delay(attempt, retry_after)
+        logger.warning(f"Telegram: {error}, retrying in {delay:.1f}s ({attempt + 1}/{settings.TELEGRAM_MAX_RETRIES})")
+        return delay
+
+    def _send_chat(self, chat: list[Digest]) -> list[Delivery]:
+        return [delivery for digest in chat for delivery in self._send_digest(digest)]
+
+    def _send_digest(self, digest: Digest) -> list[Delivery]:
+        failure = self._send(digest.chat_id, digest.text)
+        if self._resend_alone(digest, failure):
+            return [delivery for single in digest.split() for delivery in self._send_digest(single)]
+        return self._results(digest, failure)
+
+    async def _asend_digest(self, digest: Digest) -> list[Delivery]:
+        failure = await self._asend(digest.chat_id, digest.text)
+        if self._resend_alone(digest, failure):
+            return [delivery for single in digest.split() for delivery in await self._asend_digest(single)]
+        return self._results(digest, failure)
+
+    @staticmethod
+    def _resend_alone(digest: Digest, failure: SendError | None) -> bool:
+        """Whether to send the digest's listings one by one: Telegram rejected it, and not for a passing reason."""
+        if failure is None or failure.retryable or len(digest.job_ids) < 2:
+            return False
+        logger.warning(f"Telegram rejected a digest of {len(digest.job_ids)} listings, sending them one by one")
+        return True
+
+    @staticmethod
+    def _results(digest: Digest, failure: SendError | None) -> list[Delivery]:
+        if failure is None:
+            return [Delivery(job_id, True) for job_id in digest.job_ids]
+        return [Delivery(job_id, False, failure.error, failure.retryable) for job_id in digest.job_ids]
+
+    def _send(self, chat_id: str, text: str) -> SendError | None:
+        """Sends one message; returns None once it is delivered, the last error otherwise."""
+        for attempt in range(settings.TELEGRAM_MAX_RETRIES + 1):
+            for bucket in self._buckets(chat_id):
+                bucket.acquire()
+            retry_after = None
+            try:
+                response = self.transport.post(str(self.base_url), json=self._payload(text, chat_id))
+                if response.status_code == 200:
+                    return None
+                error, retry, retry_after = self._failure(response)
+            except requests.RequestException as e:
+                error, retry = str(e), True
+
+            if not retry or attempt == settings.TELEGRAM_MAX_RETRIES:
+                break
+            time.sleep(self._retry_delay(chat_id, error, attempt, retry_after))
+
+        logger.error(f"Error sending Telegram notification: {error}")
+        return SendError(error, retry)
+
+    async def _asend(self, chat_id: str, text: str) -> SendError | None:
+        transport = self.async_transport or get_async_transport()
+        for attempt in range(settings.TELEGRAM_MAX_RETRIES + 1):
+            for bucket in self._buckets(chat_id):
+                await bucket.aacquire()
+            retry_after = None
+            try:
+                response = await transport.post(str(self.base_url), json=self._payload(text, chat_id))
+                if response.status_code == 200:
+                    return None
+                error, retry, retry_after = self._failure(response)
+            except httpx.HTTPError as e:
+                error, retry = repr(e), True
+
+            if not retry or attempt == settings.TELEGRAM_MAX_RETRIES:
+                break
+            await asyncio.sleep(self._retry_delay(chat_id, error, attempt, retry_after))
+
+        logger.error(f"Error sending Telegram notification: {error}")
+        return SendError(error, retry)
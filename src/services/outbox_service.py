@@ -0,0 +1,197 @@
+"""
+Durable notification outbox.
+
+``save_jobs`` enqueues every new listing in the same transaction that inserts it,
+so a stored listing always has its messages queued, exactly once per chat (the
+message ID ``chat_id:job_id`` is the idempotency key). Delivery happens later, in
+``delivery_service.drain_outbox``:
+
+  - ``claim`` leases a batch of due messages (status ``sending``, ``available_at``
+    moved to the lease expiry, a fresh ``claim_token``); a worker that dies
+    mid-batch loses its lease and the messages become claimable again,
+  - ``record`` stores the outcome of each message, but only for the claim that is
+    still current, so a worker whose lease expired can't overwrite a newer claim.
+
+A message can therefore be sent twice only if a worker crashes between Telegram
+accepting it and ``record`` (at-least-once delivery); the queue itself never
+duplicates or loses a listing.
+"""
+
+import uuid
+from collections.abc import Collection, Iterable, Mapping
+from datetime import UTC, datetime, timedelta
+from itertools import batched
+from typing import Any
+
+from sqlalchemy import Connection, and_, func, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import col, select, update
+
+from src.config import settings
+from src.models import JobListing, OutboxMessage
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+PENDING, SENDING, SENT, FAILED = "pending", "sending", "sent", "failed"
+
+# Rows per INSERT (IDs per UPDATE in record), well under SQLite's bound-parameter limit
+ROWS_PER_STATEMENT = 500
+
+
+def message_id(chat_id: str, job_id: str) -> str:
+    return f"{chat_id}:{job_id}"
+
+
+def enqueue(connection: Connection, job_ids: Iterable[str], chat_id: str | None = settings.TELEGRAM_CHAT_ID) -> int:
+    """Queues ``job_ids`` for ``chat_id``; already queued pairs are skipped. Returns how many were new."""
+    if not chat_id:
+        return 0
+    return _insert(connection, ((job_id, chat_id) for job_id in job_ids))
+
+
+def enqueue_recipients(connection: Connection, recipients: Mapping[str, Iterable[str]]) -> int:
+    """Queues each listing for its own chats (job ID -> chat IDs), as ``enqueue`` does for one chat."""
+    return _insert(connection, ((job_id, chat_id) for job_id, chats in recipients.items() for chat_id in chats))
+
+
+def _insert(connection: Connection, pairs: Iterable[tuple[str, str]]) -> int:
+    now = datetime.now(UTC)
+    rows = (
+        {
+            "id": message_id(chat_id, job_id),
+            "job_id": job_id,
+            "chat_id": chat_id,
+            "available_at": now,
+            "created_at": now,
+        }
+        for job_id, chat_id in pairs
+    )
+    queued = 0
+    for chunk in batched(rows, ROWS_PER_STATEMENT, strict=False):
+        statement = sqlite_insert(OutboxMessage).values(chunk).on_conflict_do_nothing().returning(col(OutboxMessage.id))
+        queued += len(connection.execute(statement).all())
+    return queued
+
+
+def enqueue_unnotified(connection: Connection, chat_id: str | None = settings.TELEGRAM_CHAT_ID) -> int:
+    """Queues the listings saved before the outbox existed that were never notified nor queued."""
+    if not chat_id:
+        return 0
+    pending = select(JobListing.id).where(
+        col(JobListing.is_notified) == False,  # noqa: E712
+        col(JobListing.id).not_in(select(OutboxMessage.job_id)),
+    )
+    return enqueue(connection, connection.execute(pending).scalars().all(), chat_id)
+
+
+def claim(
+    connection: Connection,
+    limit: int = settings.OUTBOX_BATCH_SIZE,
+    exclude_chats: Collection[str] = (),
+    per_chat: int | None = None,
+) -> tuple[str, list[OutboxMessage]]:
+    """
+    Leases up to ``limit`` due messages: pending ones whose retry time has come, and
+    ``sending`` ones whose previous lease expired, except for ``exclude_chats``. They
+    are taken chat by chat, so a chat's messages land in the same batch and go out as
+    one digest. With ``per_chat`` whole chats are claimed instead, each with its best
+    ``per_chat`` due messages by the listing's stored score (unscored listings last),
+    ranked over all of the chat's due messages. Returns the claim token and the
+    claimed messages.
+    """
+    now = datetime.now(UTC)
+    token = uuid.uuid4().hex
+    is_due = and_(
+        or_(col(OutboxMessage.status) == PENDING, col(OutboxMessage.status) == SENDING),
+        col(OutboxMessage.available_at) <= now,
+        col(OutboxMessage.chat_id).not_in(exclude_chats),
+    )
+    if per_chat:
+        chats = (
+            select(OutboxMessage.chat_id)
+            .where(is_due)
+            .distinct()
+            .order_by(col(OutboxMessage.chat_id))
+            .limit(max(1, limit // per_chat))
+        )
+        rank = func.row_number().over(
+            partition_by=col(OutboxMessage.chat_id),
+            order_by=(col(JobListing.score).desc().nulls_last(), col(OutboxMessage.available_at)),
+        )
+        ranked = (
+            select(col(OutboxMessage.id), rank.label("rank"))
+            .outerjoin(JobListing, col(JobListing.id) == col(OutboxMessage.job_id))
+            .where(is_due, col(OutboxMessage.chat_id).in_(chats.scalar_subquery()))
+            .subquery()
+        )
+        due = select(ranked.c.id).where(ranked.c.rank <= per_chat)
+    else:
+        due = (
+            select(OutboxMessage.id)
+            .where(is_due)
+            .order_by(col(OutboxMessage.chat_id), col(OutboxMessage.available_at))
+            .limit(limit)
+        )
+    statement = (
+        update(OutboxMessage)
+        .where(col(OutboxMessage.id).in_(due.scalar_subquery()))
+        .values(
+            status=SENDING,
+            claim_token=token,
+            available_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+            attempts=OutboxMessage.attempts + 1,
+        )
+        .returning(OutboxMessage)
+    )
+    rows = connection.execute(statement).all()
+    return token, [OutboxMessage.model_validate(row._mapping) for row in rows]
+
+
+def record(
+    connection: Connection,
+    token: str,
+    messages: Iterable[OutboxMessage],
+    errors: Mapping[str, str | None],
+    permanent: Collection[str] = (),
+):
+    """
+    Stores the outcome of claimed messages: ``errors`` maps a message ID to None
+    (delivered) or the error. Failed messages are retried with exponential backoff
+    until OUTBOX_MAX_ATTEMPTS, then marked failed; the ones in ``permanent`` (e.g. a
+    400, which the same message would get again) are marked failed at once. Messages
+    missing from ``errors`` were not attempted (e.g. over NOTIFY_TOP_K) and go back to
+    the queue as they were.
+    """
+    now = datetime.now(UTC)
+    outcomes: dict[tuple[str, str | None, float], list[str]] = {}  # (status, error, retry delay) -> message IDs
+    for message in messages:
+        error = errors.get(message.id)
+        if message.id not in errors:
+            outcome = (PENDING, None, 0.0)
+        elif error is None:
+            outcome = (SENT, None, 0.0)
+        elif message.id in permanent:
+            outcome = (FAILED, error, 0.0)
+            logger.error(f"Outbox message {message.id} can't be delivered: {error}")
+        elif message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            outcome = (FAILED, error, 0.0)
+            logger.error(f"Giving up on outbox message {message.id} after {message.attempts} attempts: {error}")
+        else:
+            outcome = (PENDING, error, settings.OUTBOX_RETRY_SECONDS * 2 ** (message.attempts - 1))
+        outcomes.setdefault(outcome, []).append(message.id)
+
+    # One UPDATE per outcome (a drain's failures mostly share their error), not one per message
+    for (status, error, delay), message_ids in outcomes.items():
+        values: dict[str, Any]
+        if status == SENT:
+            values = {"status": SENT, "sent_at": now, "last_error": None}
+        elif status == FAILED:
+            values = {"status": FAILED, "last_error": error}
+        elif error is None:  # not attempted
+            values = {"status": PENDING, "attempts": OutboxMessage.attempts - 1, "available_at": now}
+        else:
+            values = {"status": PENDING, "last_error": error, "available_at": now + timedelta(seconds=delay)}
+        for chunk in batched(message_ids, ROWS_PER_STATEMENT, strict=False):
+            current_claim = and_(col(OutboxMessage.id).in_(chunk), col(OutboxMessage.claim_token) == token)
+            connection.execute(update(OutboxMessage).where(current_claim).values(**values))
@@ -0,0 +1,37 @@
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+from src.config import settings
+from src.models import JobListing
+from src.services.classifier import classify_jobs
+from src.services.scoring_service import ScoringService
+from src.services.storage_service import save_jobs_stream
+from src.services.subscription_service import Audience, iter_fanout, load_audience
+from src.util.normalizer import normalize_jobs
+
+
+def _count(jobs: Iterable[JobListing], stats: Counter, key: str) -> Iterator[JobListing]:
+    for job in jobs:
+        stats[key] += 1
+        yield job
+
+
+def process_jobs(
+    jobs: Iterable[JobListing], chunk_size: int = settings.DB_BATCH_SIZE, audience: Audience | None = None
+) -> dict[str, int]:
+    """
+    Stream listings through normalize → classify → fan-out → score → save.
+
+    The fan-out stage filters with every subscribed profile at once and routes each
+    listing to its chats (see subscription_service); ``audience`` is loaded from the
+    database when not given. Every stage is a generator and storage consumes
+    fixed-size chunks, so memory stays flat no matter how many pages or queries feed ``jobs``.
+    """
+    audience = audience or load_audience()
+    recipients: dict[str, list[str]] = {}
+    stats: Counter[str] = Counter()
+    stream = _count(jobs, stats, "fetched_jobs")
+    stream = classify_jobs(normalize_jobs(stream))
+    stream = _count(ScoringService.iter_score(iter_fanout(stream, audience, recipients)), stats, "selected_jobs")
+    stats.update(save_jobs_stream(stream, chunk_size, recipients))
+    return dict(stats)
@@ -0,0 +1,293 @@
+"""
+Rule engine for filtering listings, configured from a TOML file (settings.FILTER_RULES_PATH).
+
+A profile is a named list of rules. Each rule matches on terms (whole words/phrases
+or raw substrings, scoped to some text fields) and/or on predicates over the
+structured fields (salary, seniority, modality). Its ``effect`` says what a match
+does:
+
+  - ``include``: if a profile has include rules, at least one must match,
+  - ``exclude``: a match rejects the listing...
+  - ``except``:  ...unless an except rule matches too (e.g. "semi senior"),
+  - ``score``:   no gating, only adds its weight to the score.
+
+The score of a listing is the sum of the weights of its matching include/score rules.
+
+All profiles are compiled together into one plan: every (field, mode) pair gets a
+single matcher (PhraseMatcher for words, KeywordMatcher for substrings) over the
+terms of every profile, so a listing (or a batch of them) is tokenised and
+scanned once, however many profiles evaluate it.
+"""
+
+import re
+import tomllib
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Any, Literal, NamedTuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.config import settings
+from src.models import JobListing
+from src.util.keyword_matcher import SEPARATOR, KeywordMatcher, PhraseMatcher
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+TEXT_FIELDS = ("title", "description", "company_name")
+FACT_FIELDS = ("salary", "seniority", "modality")
+
+WORD_CHAR_RE = re.compile(r"\w")
+
+# (field, mode, pattern): one term as seen by one field's matcher
+TermKey = tuple[str, str, str]
+
+
+class Rule(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    name: str
+    effect: Literal["include", "exclude", "except", "score"] = "include"
+    terms: tuple[str, ...] = ()
+    # "word": whole words, multi-word terms are phrases ("semi-senior" == "semi senior");
+    # "substring": raw substring, as the old keyword lists did
+    match: Literal["word", "substring"] = "word"
+    fields: tuple[Literal["title", "description", "company_name"], ...] = TEXT_FIELDS
+    salary_min: int | None = None
+    salary_max: int | None = None
+    seniority: tuple[str, ...] = ()
+    modality: tuple[str, ...] = ()
+    weight: float = 1.0
+
+
+class Profile(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    rules: tuple[Rule, ...] = ()
+
+
+class RuleSet(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    profiles: dict[str, Profile] = Field(default_factory=dict)
+
+
+class Evaluation(NamedTuple):
+    accepted: bool
+    score: float
+    rules: tuple[str, ...]  # names of the matching rules
+    terms: frozenset[str]  # terms that matched, as written in the config
+
+
+class Facts(NamedTuple):
+    """The structured fields the predicates look at."""
+
+    salary: int | None
+    seniority: str | None
+    modality: str | None
+
+
+class _NonWordTable(dict):
+    """``str.translate`` table that turns every non-word character into a space, filled lazily."""
+
+    def __missing__(self, codepoint: int) -> int | str:
+        # The batch separator is kept, so a joined column still splits back into rows
+        value = codepoint if codepoint == 0 or WORD_CHAR_RE.match(chr(codepoint)) else " "
+        self[codepoint] = value
+        return value
+
+
+_NON_WORD = _NonWordTable()
+
+
+def _tokenize(text: str) -> str:
+    """Every run of non-word characters becomes one space, using C-level str methods instead of a regex."""
+    text = text.translate(_NON_WORD)
+    while "  " in text:
+        text = text.replace("  ", " ")
+    return text
+
+
+def prepare_text(text: str | None, mode: str) -> str:
+    """Text as the matchers see it: lower-cased, and for word mode reduced to space-separated words."""
+    text = (text or "").lower()
+    return _tokenize(text) if mode == "word" else text
+
+
+def prepare_column(values: Sequence[str | None], mode: str) -> list[str]:
+    """``prepare_text`` for a whole column, lower-casing and tokenising it with one call each."""
+    joined = SEPARATOR.join(value or "" for value in values).lower()
+    texts = (_tokenize(joined) if mode == "word" else joined).split(SEPARATOR)
+    if len(texts) != len(values):  # some value contained the separator itself
+        return [prepare_text(value, mode) for value in values]
+    return texts
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    rule: Rule
+    keys: frozenset[TermKey]
+    seniority: frozenset[str]
+    modality: frozenset[str]
+    has_predicates: bool
+
+    def matches(self, hits: frozenset[TermKey], facts: Facts) -> bool:
+        if self.keys and self.keys.isdisjoint(hits):
+            return False
+        return not self.has_predicates or self.passes(facts)
+
+    def passes(self, facts: Facts) -> bool:
+        """Whether the structured fields satisfy the rule's predicates."""
+        rule = self.rule
+        if rule.salary_min is not None and (facts.salary is None or facts.salary < rule.salary_min):
+            return False
+        if rule.salary_max is not None and (facts.salary is None or facts.salary > rule.salary_max):
+            return False
+        if self.seniority and (facts.seniority or "").lower() not in self.seniority:
+            return False
+        return not self.modality or (facts.modality or "").lower() in self.modality
+
+
+class RuleEngine:
+    """Compiled evaluation plan for a set of profiles."""
+
+    def __init__(self, rule_set: RuleSet):
+        self.rule_set = rule_set
+        self._terms: dict[TermKey, str] = {}
+        self._profiles: dict[str, tuple[_CompiledRule, ...]] = {}
+
+        for name, profile in rule_set.profiles.items():
+            self._profiles[name] = tuple(self._compile(rule) for rule in profile.rules)
+
+        patterns: dict[tuple[str, str], list[str]] = {}
+        for field, mode, pattern in self._terms:
+            patterns.setdefault((field, mode), []).append(pattern)
+        # One matcher per (field, mode), plus the pattern -> TermKey map for its hits
+        self._scopes = [
+            (
+                field,
+                mode,
+                PhraseMatcher(terms) if mode == "word" else KeywordMatcher(terms),
+                {pattern: (field, mode, pattern) for pattern in terms},
+            )
+            for (field, mode), terms in patterns.items()
+        ]
+        self._required = {
+            name: any(compiled.rule.effect == "include" for compiled in rules) for name, rules in self._profiles.items()
+        }
+
+    @property
+    def profiles(self) -> list[str]:
+        return list(self._profiles)
+
+    def _compile(self, rule: Rule) -> _CompiledRule:
+        keys = set()
+        for term in rule.terms:
+            pattern = prepare_text(term, rule.match).strip()
+            if not pattern:
+                continue
+            for field in rule.fields:
+                key = (field, rule.match, pattern)
+                self._terms[key] = term
+                keys.add(key)
+
+        return _CompiledRule(
+            rule=rule,
+            keys=frozenset(keys),
+            seniority=frozenset(value.lower() for value in rule.seniority),
+            modality=frozenset(value.lower() for value in rule.modality),
+            has_predicates=(
+                rule.salary_min is not None or rule.salary_max is not None or bool(rule.seniority or rule.modality)
+            ),
+        )
+
+    # --- Scanning: once per listing, shared by every profile ---
+
+    def scan(self, job: JobListing) -> frozenset[TermKey]:
+        return self.scan_lowered({field: (getattr(job, field) or "").lower() for field in TEXT_FIELDS})
+
+    def scan_lowered(self, texts: Mapping[str, str]) -> frozenset[TermKey]:
+        """``scan`` over text fields that are already lower-cased (field name -> text)."""
+        hits: set[TermKey] = set()
+        for field, mode, matcher, keys in self._scopes:
+            text = texts.get(field, "")
+            if mode == "word":
+                text = _tokenize(text)
+            hits.update(map(keys.__getitem__, matcher.find_all(text)))
+        return frozenset(hits)
+
+    def scan_columns(self, columns: Mapping[str, Sequence[Any]], rows: int) -> dict[TermKey, set[int]]:
+        """
+        ``scan`` over whole columns (field name -> one value per row), inverted: each
+        term found maps to the rows that contain it. Missing columns count as empty.
+        """
+        hits: dict[TermKey, set[int]] = {}
+        for field, mode, matcher, keys in self._scopes:
+            column = columns.get(field) or [None] * rows
+            for pattern, found in matcher.find_rows(prepare_column(column, mode)).items():
+                hits[keys[pattern]] = found
+        return hits
+
+    # --- Evaluation: cheap set operations per profile ---
+
+    def evaluate(self, hits: frozenset[TermKey], facts: Facts, profile: str = "default") -> Evaluation:
+        rules = self._profiles[profile]
+        matched = [compiled for compiled in rules if compiled.matches(hits, facts)]
+
+        effects = {compiled.rule.effect for compiled in matched}
+        excluded = "exclude" in effects and "except" not in effects
+        accepted = not excluded and (not self._required[profile] or "include" in effects)
+
+        return Evaluation(
+            accepted=accepted,
+            score=sum(c.rule.weight for c in matched if c.rule.effect in ("include", "score")),
+            rules=tuple(compiled.rule.name for compiled in matched),
+            terms=frozenset(self._terms[key] for compiled in matched for key in compiled.keys & hits),
+        )
+
+    def evaluate_columns(
+        self, hits: Mapping[TermKey, set[int]], facts: Sequence[Facts], profile: str = "default"
+    ) -> tuple[list[bool], list[frozenset[str]]]:
+        """
+        ``evaluate`` for a whole batch, rule by rule instead of row by row: each rule's
+        matching rows are a set union of its terms' rows (``scan_columns``), narrowed
+        by its predicates, and the effects combine as set operations. Returns, per
+        row, whether it is accepted and the terms that matched.
+        """
+        everyone = set(range(len(facts)))
+        matched_by_effect: dict[str, set[int]] = {"include": set(), "exclude": set(), "except": set(), "score": set()}
+        terms: dict[int, set[str]] = {}
+        for compiled in self._profiles[profile]:
+            matched = set().union(*(hits.get(key, ()) for key in compiled.keys)) if compiled.keys else everyone
+            if compiled.has_predicates:
+                matched = {row for row in matched if compiled.passes(facts[row])}
+            matched_by_effect[compiled.rule.effect] |= matched
+            for key in compiled.keys:
+                for row in hits.get(key, set()) & matched:
+                    terms.setdefault(row, set()).add(self._terms[key])
+
+        accepted = set(matched_by_effect["include"]) if self._required[profile] else set(everyone)
+        accepted -= matched_by_effect["exclude"] - matched_by_effect["except"]
+        rows = range(len(facts))
+        return [row in accepted for row in rows], [frozenset(terms.get(row, ())) for row in rows]
+
+    def evaluate_job(self, job: JobListing, profiles: Iterable[str] = ("default",)) -> dict[str, Evaluation]:
+        """Evaluates one listing against several profiles with a single scan."""
+        hits = self.scan(job)
+        facts = Facts(job.salary, job.seniority, job.modality)
+        return {profile: self.evaluate(hits, facts, profile) for profile in profiles}
+
+
+def load_rule_set(path: Path) -> RuleSet:
+    with path.open("rb") as f:
+        return RuleSet.model_validate(tomllib.load(f))
+
+
+@cache
+def get_rule_engine(path: Path = settings.FILTER_RULES_PATH) -> RuleEngine:
+    """Compiled engine for the rules file; built once per process."""
+    engine = RuleEngine(load_rule_set(path))
+    logger.info(f"Loaded filter profiles {engine.profiles} from {path}")
+    return engine
@@ -0,0 +1,65 @@
+import heapq
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+
+from src.config import settings
+from src.models import JobListing
+from src.services.classifier import evaluate_job
+from src.services.rule_engine import Evaluation
+from src.util.logger_config import get_logger
+from src.util.normalizer import parse_datetime
+
+logger = get_logger(__name__)
+
+
+class ScoringService:
+    """
+    Ranks the listings that passed the filter.
+
+    score = weights of the matching include/score rules (keywords, salary,
+    seniority and modality preferences from src/filter_rules.toml)
+          + a recency bonus that halves every SCORE_RECENCY_HALF_LIFE_DAYS.
+
+    The score is stored on the listing (``JobListing.score``) when it is saved, so
+    ranking later on (e.g. which pending jobs to notify) needs no recomputation.
+    """
+
+    @staticmethod
+    def score(job: JobListing, evaluation: Evaluation | None = None, now: datetime | None = None) -> float:
+        if evaluation is None:
+            evaluation = evaluate_job(job)["default"]
+        return round(evaluation.score + ScoringService.recency_bonus(job.posted_date, now), 3)
+
+    @staticmethod
+    def recency_bonus(posted_date: datetime | str | None, now: datetime | None = None) -> float:
+        posted = parse_datetime(posted_date)
+        if posted is None:
+            return 0.0
+        if posted.tzinfo is None:
+            posted = posted.replace(tzinfo=UTC)
+
+        age_days = max(0.0, ((now or datetime.now(UTC)) - posted).total_seconds() / 86400)
+        return settings.SCORE_RECENCY_WEIGHT * 0.5 ** (age_days / settings.SCORE_RECENCY_HALF_LIFE_DAYS)
+
+    @staticmethod
+    def iter_score(matches: Iterable[tuple[JobListing, Evaluation]]) -> Iterator[JobListing]:
+        """Sets ``score`` on each (listing, evaluation) pair coming from FilterService.iter_matches."""
+        now = datetime.now(UTC)
+        for job, evaluation in matches:
+            job.score = ScoringService.score(job, evaluation, now)
+            yield job
+
+    @staticmethod
+    def top_k(jobs: Iterable[JobListing], k: int) -> list[JobListing]:
+        """
+        The ``k`` best listings, best first, selected with a heap (O(n log k), no full sort).
+        Listings saved before scoring existed are scored on the fly.
+        """
+        now = datetime.now(UTC)
+
+        def key(job: JobListing) -> float:
+            if job.score is None:
+                job.score = ScoringService.score(job, now=now)
+            return job.score
+
+        return heapq.nlargest(k, jobs, key=key)
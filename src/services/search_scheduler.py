@@ -0,0 +1,187 @@
+"""
+Search plan: every configured query x location x source, as few provider requests as possible.
+
+``build_plan`` expands SEARCH_QUERIES x SEARCH_LOCATIONS x SEARCH_SOURCES and merges
+the entries that would send a provider the same request (same URL and params once
+the query and location are normalised). E.g. GetOnBoard ignores the location, so one
+query in three locations is a single GetOnBoard request, with a single checkpoint. ``run_source``/``arun_source``
+then run one provider's requests concurrently (SEARCH_CONCURRENCY) within the run's
+request budget (REQUEST_BUDGETS):
+  - each request resumes from its checkpoint, so a new query only costs its own
+    calls and the others stay incremental,
+  - listings already read by another request of the run are dropped before the
+    pipeline (provider IDs are unique per provider; duplicates across providers
+    are storage's near-duplicate detection),
+  - a request cut short by the budget keeps what it read but doesn't advance its
+    checkpoint, so the next run reads it again instead of skipping what it missed.
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+from src.clients.adzuna import AdzunaClient
+from src.clients.base import BaseJobClient
+from src.clients.errors import BudgetExhaustedError
+from src.clients.getonboard import GetOnBoardClient
+from src.clients.jsearch import JSearchClient
+from src.config import settings
+from src.models import JobListing, SearchCriteria
+from src.services.checkpoint_service import aiter_new_pages, iter_new_jobs, load_checkpoint, save_checkpoint
+from src.services.pipeline import process_jobs
+from src.services.subscription_service import Audience, load_audience
+from src.util.logger_config import get_logger
+from src.util.rate_limiter import RequestBudget
+
+logger = get_logger(__name__)
+
+CLIENTS: dict[str, type[BaseJobClient]] = {
+    "JSearch": JSearchClient,
+    "GetOnBoard": GetOnBoardClient,
+    "Adzuna": AdzunaClient,
+}
+
+# Per-source keyword arguments for iter_jobs/aiter_pages
+SOURCE_OPTIONS: dict[str, dict[str, Any]] = {
+    "Adzuna": {"recent_days": 2},
+}
+
+
+class PlannedRequest(NamedTuple):
+    source: str
+    criteria: SearchCriteria
+    key: str  # BaseJobClient.request_key, without the date window; also keys the checkpoint
+    covers: tuple[str, ...]  # the "query @ location" entries it answers
+
+
+def normalize_criteria(query: str, location: str | None, date_posted: str | None = None) -> SearchCriteria:
+    """Case and whitespace don't change what the providers return."""
+    return SearchCriteria(
+        query=" ".join(query.split()).casefold(),
+        location=location.strip().lower() if location else None,
+        date_posted=date_posted,
+    )
+
+
+def build_plan(
+    queries: Iterable[str] | None = None,
+    locations: Iterable[str | None] | None = None,
+    sources: Iterable[str] | None = None,
+) -> dict[str, list[PlannedRequest]]:
+    """The requests to send, per source; entries answered by the same request are merged."""
+    queries = list(queries or settings.SEARCH_QUERIES)
+    locations = list(locations or settings.SEARCH_LOCATIONS or [None])
+    plan: dict[str, list[PlannedRequest]] = {}
+    entries = 0
+
+    for source in sources or settings.SEARCH_SOURCES:
+        client = CLIENTS[source]()
+        options = SOURCE_OPTIONS.get(source, {})
+        merged: dict[str, list[SearchCriteria]] = {}
+        for query in queries:
+            for location in locations:
+                criteria = normalize_criteria(query, location)
+                merged.setdefault(client.request_key(criteria, **options), []).append(criteria)
+                entries += 1
+
+        plan[source] = [
+            PlannedRequest(
+                source,
+                group[0].model_copy(update={"date_posted": settings.SEARCH_DATE_POSTED}),
+                key,
+                tuple(f"{criteria.query} @ {criteria.location}" for criteria in group),
+            )
+            for key, group in merged.items()
+        ]
+        for request in plan[source]:
+            if len(request.covers) > 1:
+                logger.debug(f"{source}: one request answers {', '.join(request.covers)}")
+
+    requests = sum(map(len, plan.values()))
+    logger.info(f"Search plan: {entries} query/location/source entries merged into {requests} requests")
+    return plan
+
+
+def new_client(source: str) -> BaseJobClient:
+    """A client for one run, with its own request budget."""
+    return CLIENTS[source](budget=RequestBudget(settings.REQUEST_BUDGETS.get(source)))
+
+
+def run_source(source: str, requests: list[PlannedRequest], audience: Audience | None = None) -> dict[str, int]:
+    """Runs one provider's requests concurrently through the pipeline."""
+    client = new_client(source)
+    audience = audience or load_audience()
+    seen: set[str] = set()
+
+    def run(request: PlannedRequest) -> Counter[str]:
+        stats: Counter[str] = Counter()
+        checkpoint = load_checkpoint(source, request.criteria, request.key)
+        jobs = iter_new_jobs(client, request.criteria, checkpoint, **SOURCE_OPTIONS.get(source, {}))
+        stats.update(process_jobs(_unseen(_within_budget(jobs, stats), seen, stats), audience=audience))
+        if not stats["budget_exhausted"]:
+            save_checkpoint(checkpoint)
+        return stats
+
+    with ThreadPoolExecutor(max_workers=settings.SEARCH_CONCURRENCY) as executor:
+        totals = sum(executor.map(run, requests), Counter())
+    return _report(source, requests, client, totals)
+
+
+async def arun_source(source: str, requests: list[PlannedRequest], audience: Audience | None = None) -> dict[str, int]:
+    """``run_source`` on the event loop; the blocking pipeline work runs in worker threads."""
+    client = new_client(source)
+    audience = audience or await asyncio.to_thread(load_audience)
+    seen: set[str] = set()
+    workers = asyncio.Semaphore(settings.SEARCH_CONCURRENCY)
+
+    async def run(request: PlannedRequest) -> Counter[str]:
+        stats: Counter[str] = Counter()
+        async with workers:
+            checkpoint = await asyncio.to_thread(load_checkpoint, source, request.criteria, request.key)
+            pages = aiter_new_pages(client, request.criteria, checkpoint, **SOURCE_OPTIONS.get(source, {}))
+            async for page in _awithin_budget(pages, stats):
+                if jobs := list(_unseen(page, seen, stats)):
+                    stats.update(await asyncio.to_thread(process_jobs, jobs, audience=audience))
+            if not stats["budget_exhausted"]:
+                await asyncio.to_thread(save_checkpoint, checkpoint)
+        return stats
+
+    totals = sum(await asyncio.gather(*(run(request) for request in requests)), Counter())
+    return _report(source, requests, client, totals)
+
+
+def _unseen(jobs: Iterable[JobListing], seen: set[str], stats: Counter[str]) -> Iterator[JobListing]:
+    for job in jobs:
+        if job.id in seen:
+            stats["run_duplicates"] += 1
+            continue
+        seen.add(job.id)
+        yield job
+
+
+def _within_budget(jobs: Iterator[JobListing], stats: Counter[str]) -> Iterator[JobListing]:
+    try:
+        yield from jobs
+    except BudgetExhaustedError as e:
+        logger.warning(f"{e}, stopping the query early")
+        stats["budget_exhausted"] += 1
+
+
+async def _awithin_budget(
+    pages: AsyncIterator[list[JobListing]], stats: Counter[str]
+) -> AsyncIterator[list[JobListing]]:
+    try:
+        async for page in pages:
+            yield page
+    except BudgetExhaustedError as e:
+        logger.warning(f"{e}, stopping the query early")
+        stats["budget_exhausted"] += 1
+
+
+def _report(source: str, requests: list[PlannedRequest], client: BaseJobClient, totals: Counter[str]) -> dict[str, int]:
+    budget = client.budget
+    totals["api_requests"] = budget.spent if budget is not None else 0
+    logger.info(f"{source}: {dict(totals)} across {len(requests)} requests")
+    return dict(totals)
@@ -1,7 +1,16 @@
-from sqlmodel import Session, SQLModel, create_engine, select
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import UTC, datetime, timedelta
+from itertools import batched
+from typing import Any, overload
+
+from sqlalchemy import Row, and_, case, func, inspect, literal, null, or_, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, SQLModel, col, create_engine, select, update
 
 from src.config import settings
-from src.models import JobListing
+from src.models import JobFingerprint, JobListing
+from src.services import outbox_service
+from src.services.dedup_service import find_near_duplicates, index_jobs
 from src.util.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -17,6 +26,10 @@ engine = create_engine(
 )
 
 
+# SQLite >= 3.32 (and libsql) accept at most 32766 bound parameters per statement
+SQLITE_MAX_VARIABLES = 32766
+
+
 def get_session():
     """Generator that yields a database session."""
     with Session(engine) as session:
@@ -24,115 +37,295 @@ def get_session():
 
 
 def init_db():
-    """Initialize the database tables."""
+    """
+    Initialize the database tables.
+    Columns and indexes missing from an existing database are created in place.
+    """
     logger.info("Initializing Turso database...")
     try:
         SQLModel.metadata.create_all(engine)
         logger.info("Database tables created successfully")
+        _add_missing_columns()
+        _create_missing_indexes()
+        if settings.DEDUP_ENABLED:
+            _index_missing_fingerprints()
+        _enqueue_unnotified()
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
 
 
-def save_jobs(jobs: list[JobListing]):
+def _add_missing_columns():
+    # create_all never alters existing tables; new nullable columns are added one by one
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {column["name"] for column in inspect(engine).get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=engine.dialect)
+                with engine.begin() as connection:
+                    connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+                logger.info(f"Added column {column.name} to {table.name}")
+
+
+def _create_missing_indexes():
+    # create_all skips tables that already exist, and with them any index added later
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {index["name"] for index in inspect(engine).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(engine, checkfirst=True)
+                logger.info(f"Created index {index.name} on {table.name}")
+
+
+def _index_missing_fingerprints():
+    # Listings saved before near-duplicate detection existed get their fingerprints here
+    missing = col(JobListing.id).not_in(select(JobFingerprint.job_id))
+    columns = ["title", "company_name", "location", "description"]
+    indexed = 0
+    for chunk in batched(iter_jobs(missing, columns=columns), settings.DB_BATCH_SIZE, strict=False):
+        with engine.begin() as connection:
+            index_jobs(connection, chunk)
+        indexed += len(chunk)
+    if indexed:
+        logger.info(f"Fingerprinted {indexed} existing jobs for near-duplicate detection")
+
+
+def _enqueue_unnotified():
+    # Listings left unnotified before the outbox existed (or while no chat was configured)
+    with engine.begin() as connection:
+        queued = outbox_service.enqueue_unnotified(connection)
+    if queued:
+        logger.info(f"Queued {queued} unnotified jobs in the notification outbox")
+
+
+def save_jobs(
+    jobs: list[JobListing],
+    batch_size: int = settings.DB_BATCH_SIZE,
+    recipients: Mapping[str, Sequence[str]] | None = None,
+) -> dict[str, int]:
     """
     Save jobs to the database.
-    Ignores duplicates based on primary key (id).
+    Ignores duplicates based on primary key (id) and, with DEDUP_ENABLED, near-duplicates
+    of stored listings coming from another source (see dedup_service). New listings are
+    queued for notification in the same transaction (see outbox_service): to their chats
+    in ``recipients`` (job ID -> chat IDs, see subscription_service), or to
+    TELEGRAM_CHAT_ID without it.
+
+    Each batch is a single ``INSERT ... ON CONFLICT(id) DO NOTHING RETURNING id``,
+    so the database reports exactly which rows were new in one round trip.
     """
     if not jobs:
         logger.info("No jobs to save")
-        return
+        return {"new_jobs": 0, "duplicate_jobs": 0, "near_duplicate_jobs": 0}
 
     logger.info(f"Saving {len(jobs)} jobs to database...")
-    new_jobs = 0
-    duplicate_jobs = 0
+    rows_per_statement = max(1, min(batch_size, SQLITE_MAX_VARIABLES // len(inspect(JobListing).local_table.columns)))
+    new_ids: list[str] = []
+    near_duplicates = 0
+
+    try:
+        with engine.begin() as connection:
+            for batch in batched(jobs, rows_per_statement, strict=False):
+                if settings.DEDUP_ENABLED:
+                    duplicate_of = find_near_duplicates(connection, batch)
+                    near_duplicates += len(duplicate_of)
+                    batch = [job for job in batch if job.id not in duplicate_of]
+                    if not batch:
+                        continue
+
+                statement = (
+                    sqlite_insert(JobListing)
+                    .values([job.model_dump() for job in batch])
+                    .on_conflict_do_nothing(index_elements=["id"])
+                    .returning(col(JobListing.id))
+                )
+                inserted = set(connection.execute(statement).scalars())
+                new_ids.extend(inserted)
+
+                if settings.DEDUP_ENABLED:
+                    index_jobs(connection, (job for job in batch if job.id in inserted))
+                if recipients is None:
+                    outbox_service.enqueue(connection, inserted)
+                else:
+                    outbox_service.enqueue_recipients(connection, {j_id: recipients.get(j_id, ()) for j_id in inserted})
+    except Exception as e:
+        logger.error(f"Failed to save jobs: {e}")
+        raise
+
+    new_jobs = len(new_ids)
+    duplicate_jobs = len(jobs) - new_jobs - near_duplicates
+    logger.info(
+        f"✅ Saved {new_jobs} new jobs, skipped {duplicate_jobs} duplicates and {near_duplicates} near-duplicates"
+    )
+    return {"new_jobs": new_jobs, "duplicate_jobs": duplicate_jobs, "near_duplicate_jobs": near_duplicates}
+
+
+def save_jobs_stream(
+    jobs: Iterable[JobListing],
+    chunk_size: int = settings.DB_BATCH_SIZE,
+    recipients: dict[str, list[str]] | None = None,
+) -> dict[str, int]:
+    """
+    Save jobs from any iterable, ``chunk_size`` at a time.
+    Only one chunk is held in memory, however many jobs the iterable produces;
+    ``recipients`` entries are dropped once their chunk is saved.
+    """
+    totals = {"new_jobs": 0, "duplicate_jobs": 0, "near_duplicate_jobs": 0}
+    for chunk in batched(jobs, chunk_size, strict=False):
+        for key, count in save_jobs(list(chunk), recipients=recipients).items():
+            totals[key] += count
+        if recipients is not None:
+            for job in chunk:
+                recipients.pop(job.id, None)
+    return totals
+
+
+@overload
+def iter_jobs(*where: Any, columns: None = None, page_size: int = ...) -> Iterator[JobListing]: ...
+
+
+@overload
+def iter_jobs(*where: Any, columns: Sequence[str], page_size: int = ...) -> Iterator[Row]: ...
 
+
+def iter_jobs(
+    *where: Any,
+    columns: Sequence[str] | None = None,
+    page_size: int = settings.DB_BATCH_SIZE,
+) -> Iterator[JobListing] | Iterator[Row]:
+    """
+    Stream jobs in ``(created_at, id)`` order using keyset pagination.
+
+    Each page is a separate short query that resumes after the last key seen, so
+    memory is bounded by ``page_size`` however large the table is. All pages share
+    one session, which is closed when the iterator is exhausted or discarded. ``where`` takes
+    SQLAlchemy filter expressions. With ``columns`` only those columns are fetched
+    (e.g. to skip ``description``) and rows are yielded as ``Row`` objects, which
+    support the same attribute access as ``JobListing``.
+    """
+    created_at, job_id = col(JobListing.created_at), col(JobListing.id)
+    if columns:
+        names = dict.fromkeys(("id", "created_at", *columns))  # the cursor needs both keys
+        statement = select(*(getattr(JobListing, name) for name in names))
+    else:
+        statement = select(JobListing)
+    statement = statement.where(*where).order_by(created_at, job_id).limit(page_size)
+
+    cursor = None
     with Session(engine) as session:
-        for job in jobs:
-            # Check if exists
-            existing = session.get(JobListing, job.id)
-            if not existing:
-                session.add(job)
-                new_jobs += 1
-                logger.debug(f"Added new job: {job.title} at {job.company_name}")
-            else:
-                duplicate_jobs += 1
-                logger.debug(f"Skipping duplicate job: {job.title} at {job.company_name}")
+        while True:
+            page_statement = statement
+            if cursor is not None:
+                last_created_at, last_id = cursor
+                page_statement = statement.where(
+                    or_(created_at > last_created_at, and_(created_at == last_created_at, job_id > last_id))
+                )
 
-        try:
-            session.commit()
-            logger.info(f"✅ Saved {new_jobs} new jobs, skipped {duplicate_jobs} duplicates")
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Failed to save jobs: {e}")
-            raise
+            page = session.exec(page_statement).all()
+            yield from page
+            if len(page) < page_size:
+                return
+            cursor = (page[-1].created_at, page[-1].id)
 
 
 def get_unnotified_jobs() -> list[JobListing]:
     """Retrieve jobs that haven't been notified yet."""
     logger.debug("Fetching unnotified jobs from database...")
-    with Session(engine) as session:
-        statement = select(JobListing).where(JobListing.is_notified == False)  # noqa: E712
-        results = session.exec(statement)
-        jobs = list(results)
-        logger.info(f"Found {len(jobs)} unnotified jobs")
-        return jobs
+    jobs = list(iter_jobs(col(JobListing.is_notified) == False))  # noqa: E712
+    logger.info(f"Found {len(jobs)} unnotified jobs")
+    return jobs
 
 
 def get_all_jobs() -> list[JobListing]:
     """Retrieve all jobs from the database."""
     logger.debug("Fetching all jobs from database...")
-    with Session(engine) as session:
-        statement = select(JobListing)
-        results = session.exec(statement)
-        jobs = list(results)
-        logger.info(f"Found {len(jobs)} total jobs")
-        return jobs
+    jobs = list(iter_jobs())
+    logger.info(f"Found {len(jobs)} total jobs")
+    return jobs
+
 
+def mark_jobs_as_notified(
+    job_ids: list[str],
+    delivered_ids: Iterable[str] | None = None,
+    batch_size: int = settings.DB_BATCH_SIZE,
+) -> dict[str, int]:
+    """
+    Mark specific jobs as notified with one ``UPDATE ... WHERE id IN (...)`` per batch.
+
+    If ``delivered_ids`` is given, only jobs present in it are marked, so jobs whose
+    notification failed stay pending for the next run.
+    """
+    if delivered_ids is not None:
+        delivered = set(delivered_ids)
+        undelivered = sum(1 for j_id in job_ids if j_id not in delivered)
+        if undelivered:
+            logger.warning(f"{undelivered} jobs were not delivered, leaving them unnotified")
+        job_ids = [j_id for j_id in job_ids if j_id in delivered]
 
-def mark_jobs_as_notified(job_ids: list[str]):
-    """Mark specific jobs as notified."""
-    if not job_ids:
+    unique_ids = list(dict.fromkeys(job_ids))
+    if not unique_ids:
         logger.info("No jobs to mark as notified")
-        return
+        return {"notified_jobs": 0, "missing_jobs": 0}
 
-    logger.info(f"Marking {len(job_ids)} jobs as notified...")
+    logger.info(f"Marking {len(unique_ids)} jobs as notified...")
+    ids_per_statement = max(1, min(batch_size, SQLITE_MAX_VARIABLES - 1))
     notified_count = 0
-    missing_count = 0
 
-    with Session(engine) as session:
-        for j_id in job_ids:
-            job = session.get(JobListing, j_id)
-            if job:
-                job.is_notified = True
-                session.add(job)
-                notified_count += 1
-                logger.debug(f"Marked job as notified: {job.title} at {job.company_name}")
-            else:
-                missing_count += 1
-                logger.warning(f"Job not found in database: {j_id}")
+    try:
+        with engine.begin() as connection:
+            for batch in batched(unique_ids, ids_per_statement, strict=False):
+                statement = update(JobListing).where(col(JobListing.id).in_(batch)).values(is_notified=True)
+                notified_count += connection.execute(statement).rowcount
+    except Exception as e:
+        logger.error(f"Failed to mark jobs as notified: {e}")
+        raise
 
-        try:
-            session.commit()
-            logger.info(f"✅ Marked {notified_count} jobs as notified, {missing_count} not found")
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Failed to mark jobs as notified: {e}")
-            raise
+    missing_count = len(unique_ids) - notified_count
+    if missing_count:
+        logger.warning(f"{missing_count} jobs not found in database")
+    logger.info(f"✅ Marked {notified_count} jobs as notified, {missing_count} not found")
+    return {"notified_jobs": notified_count, "missing_jobs": missing_count}
 
 
-def get_job_stats() -> dict[str, int]:
-    """Get statistics about jobs in the database."""
-    with Session(engine) as session:
-        total = session.exec(select(JobListing)).all()
-        notified = session.exec(
-            select(JobListing).where(JobListing.is_notified == True)  # noqa: E712
-        ).all()
-
-        stats = {
-            "total_jobs": len(total),
-            "notified_jobs": len(notified),
-            "unnotified_jobs": len(total) - len(notified),
-        }
-        logger.info(f"Database stats: {stats}")
-        return stats
+def get_job_stats(days: int = 30) -> dict[str, Any]:
+    """
+    Get statistics about jobs in the database.
+
+    Totals and the per-source/seniority/modality/day breakdowns (each with total and
+    notified counts) come from a single aggregate query; no listing rows are loaded.
+    ``by_day`` covers the last ``days`` days of ``created_at``.
+    """
+    notified = func.coalesce(func.sum(case((col(JobListing.is_notified), 1), else_=0)), 0)
+    since = datetime.now(UTC) - timedelta(days=days)
+
+    def grouped(dimension: str, value: Any, *where: Any):
+        return (
+            select(literal(dimension).label("dimension"), value.label("value"), func.count(), notified)
+            .where(*where)
+            .group_by(value)
+        )
+
+    statement = union_all(
+        select(literal("total"), null(), func.count(), notified).select_from(JobListing),
+        grouped("source", col(JobListing.source)),
+        grouped("seniority", col(JobListing.seniority)),
+        grouped("modality", col(JobListing.modality)),
+        grouped("day", func.date(JobListing.created_at), col(JobListing.created_at) >= since),
+    )
+
+    stats: dict[str, Any] = {"by_source": {}, "by_seniority": {}, "by_modality": {}, "by_day": {}}
+    with engine.connect() as connection:
+        for dimension, value, total, notified_count in connection.execute(statement):
+            if dimension == "total":
+                stats["total_jobs"] = total
+                stats["notified_jobs"] = notified_count
+                stats["unnotified_jobs"] = total - notified_count
+            else:
+                key = value if value is not None else "Unknown"
+                stats[f"by_{dimension}"][key] = {"total": total, "notified": notified_count}
+
+    logger.info(
+        f"Database stats: {stats['total_jobs']} total, {stats['notified_jobs']} notified, "
+        f"{stats['unnotified_jobs']} unnotified"
+    )
+    return stats
@@ -0,0 +1,113 @@
+"""
+Subscriptions: which chats receive the listings accepted by which filter profile.
+
+A run loads the active subscriptions once into an ``Audience`` (profile -> chats).
+``iter_fanout`` then evaluates each listing once per distinct profile, on the
+classification cached by the classifier (the text is scanned once, however many
+profiles), and hands the listing to every chat subscribed to a profile that
+accepts it. The cost per listing grows with the number of profiles, not of
+subscribers, so thousands of chats sharing a handful of profiles cost about the
+same as one.
+
+The chat in TELEGRAM_CHAT_ID stays subscribed to the ``default`` profile.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import col, select, update
+
+from src.config import settings
+from src.models import JobListing, Subscription
+from src.services import storage_service
+from src.services.classifier import evaluate_job
+from src.services.rule_engine import Evaluation, get_rule_engine
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class Audience:
+    """Active subscriptions grouped by profile; a profile without chats still filters what gets saved."""
+
+    def __init__(self, chats_by_profile: Mapping[str, Sequence[str]]):
+        self.chats_by_profile = {profile: tuple(dict.fromkeys(chats)) for profile, chats in chats_by_profile.items()}
+        self.profiles = tuple(self.chats_by_profile)
+
+    @property
+    def chats(self) -> int:
+        return len({chat for chats in self.chats_by_profile.values() for chat in chats})
+
+    def match(self, job: JobListing) -> tuple[Evaluation | None, list[str]]:
+        """
+        The best scoring evaluation among the profiles that accept ``job`` (None if
+        none does) and the chats to notify, each once.
+        """
+        best, recipients = None, {}
+        for profile, evaluation in evaluate_job(job, self.profiles).items():
+            if not evaluation.accepted:
+                continue
+            if best is None or evaluation.score > best.score:
+                best = evaluation
+            recipients.update(dict.fromkeys(self.chats_by_profile[profile]))
+        return best, list(recipients)
+
+
+def load_audience() -> Audience:
+    """The active subscriptions, plus TELEGRAM_CHAT_ID on ``default``; subscriptions to unknown profiles are skipped."""
+    known = set(get_rule_engine().profiles)
+    chats_by_profile: dict[str, list[str]] = {"default": []}
+    if settings.TELEGRAM_CHAT_ID:
+        chats_by_profile["default"].append(settings.TELEGRAM_CHAT_ID)
+
+    statement = select(Subscription.profile, Subscription.chat_id).where(col(Subscription.active) == True)  # noqa: E712
+    with storage_service.engine.connect() as connection:
+        for profile, chat_id in connection.execute(statement):
+            if profile in known:
+                chats_by_profile.setdefault(profile, []).append(chat_id)
+            else:
+                logger.warning(f"Subscription of chat {chat_id} to unknown profile '{profile}' skipped")
+
+    audience = Audience(chats_by_profile)
+    logger.info(f"Loaded {audience.chats} subscribed chats over profiles {list(audience.profiles)}")
+    return audience
+
+
+def iter_fanout(
+    jobs: Iterable[JobListing], audience: Audience, recipients: dict[str, list[str]]
+) -> Iterator[tuple[JobListing, Evaluation]]:
+    """
+    Filter stage for several profiles at once: yields (listing, best evaluation) for
+    the listings at least one profile accepts, and records their chats in ``recipients``
+    (job ID -> chat IDs) for ``save_jobs`` to queue.
+    """
+    for job in jobs:
+        evaluation, chats = audience.match(job)
+        if evaluation is not None:
+            recipients[job.id] = chats
+            yield job, evaluation
+
+
+def subscribe(chat_id: str, profile: str = "default") -> Subscription:
+    """Subscribes ``chat_id`` to ``profile`` (re-activating a previous subscription)."""
+    if profile not in get_rule_engine().profiles:
+        raise ValueError(f"Unknown filter profile '{profile}'")
+    statement = (
+        sqlite_insert(Subscription)
+        .values(chat_id=chat_id, profile=profile, active=True)
+        .on_conflict_do_update(index_elements=["chat_id", "profile"], set_={"active": True})
+        .returning(Subscription)
+    )
+    with storage_service.engine.begin() as connection:
+        row = connection.execute(statement).one()
+    logger.info(f"Chat {chat_id} subscribed to profile '{profile}'")
+    return Subscription.model_validate(row._mapping)
+
+
+def unsubscribe(chat_id: str, profile: str | None = None) -> int:
+    """Deactivates the subscriptions of ``chat_id`` (to ``profile`` only, if given). Returns how many."""
+    statement = update(Subscription).where(col(Subscription.chat_id) == chat_id).values(active=False)
+    if profile is not None:
+        statement = statement.where(col(Subscription.profile) == profile)
+    with storage_service.engine.begin() as connection:
+        return connection.execute(statement).rowcount
@@ -0,0 +1,90 @@
+"""
+Single-pass HTML -> Markdown conversion for job descriptions.
+Usage: from src.util.html_markdown import html_to_markdown, listing_markdown
+"""
+
+import re
+from html import unescape
+
+from src.models import JobListing
+
+# Every tag, in one alternation-free pattern: group 1 marks closing tags, group 2 is the name
+TAG_RE = re.compile(r"<(/?)([a-zA-Z0-9]*)[^>]*>")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+# A preview converts a prefix of the HTML this long first, doubling it while the output is too short
+PREVIEW_INPUT_FACTOR = 2
+
+ELLIPSIS = "…"
+
+# tag -> (text written for the opening tag, text written for the closing tag); other tags are dropped
+TAG_MARKDOWN = {
+    "strong": ("**", "**"),
+    "b": ("**", "**"),
+    "li": ("- ", "\n"),
+    "br": ("\n", ""),
+    "p": ("", "\n\n"),
+}
+
+
+def _replace_tag(match: re.Match) -> str:
+    return TAG_MARKDOWN.get(match[2].lower(), ("", ""))[1 if match[1] else 0]
+
+
+def _convert(text: str) -> str:
+    text = unescape(TAG_RE.sub(_replace_tag, text))
+    return BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+def _prefix_end(text: str, end: int) -> int:
+    """Moves ``end`` back so the prefix does not split a tag or a character reference."""
+    if text.rfind("<", 0, end) > text.rfind(">", 0, end):
+        end = text.rfind("<", 0, end)
+    ampersand = text.rfind("&", max(0, end - 10), end)
+    if ampersand != -1 and ";" not in text[ampersand:end]:
+        end = ampersand
+    return end
+
+
+def _truncate(markdown: str, max_chars: int) -> str:
+    return markdown if len(markdown) <= max_chars else markdown[:max_chars].rstrip() + ELLIPSIS
+
+
+def html_to_markdown(text: str | None, max_chars: int | None = None) -> str:
+    """
+    Converts ``text`` with a single pass over its tags (instead of one regex pass per tag).
+
+    With ``max_chars`` only as much of the HTML as the preview needs is converted, and the
+    result is cut to ``max_chars`` characters (plus an ellipsis).
+    """
+    text = text or ""
+    if max_chars is not None:
+        size = max_chars * PREVIEW_INPUT_FACTOR
+        while size < len(text):
+            markdown = _convert(text[: _prefix_end(text, size)])
+            if len(markdown) > max_chars:
+                return _truncate(markdown, max_chars)
+            size *= PREVIEW_INPUT_FACTOR
+
+    markdown = _convert(text)
+    return markdown if max_chars is None else _truncate(markdown, max_chars)
+
+
+def listing_markdown(job: JobListing, max_chars: int | None = None) -> str:
+    """
+    ``html_to_markdown`` of the listing's description, cached on the listing: each
+    description is converted at most once per length, and previews of an already
+    converted description are cut from it instead of parsed again.
+    """
+    description, results = getattr(job, "_markdown", (None, {}))
+    if description != job.description:
+        results = {}
+        job._markdown = (job.description, results)
+
+    if max_chars not in results:
+        full = results.get(None)
+        if full is not None and max_chars is not None:
+            results[max_chars] = _truncate(full, max_chars)
+        else:
+            results[max_chars] = html_to_markdown(job.description, max_chars)
+    return results[max_chars]
@@ -0,0 +1,153 @@
+"""
+Shared HTTP transport for every API client and the notifier.
+Usage: from src.util.http_client import get_transport
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import settings
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "User-Agent": "job-scouting/0.1",
+}
+
+
+class HttpTransport:
+    """
+    Thin wrapper around a ``requests.Session`` with per-host connection pooling.
+
+    Connections are kept alive and reused across calls, so only the first request
+    to each host pays for the TCP/TLS handshake. Every request gets a default
+    ``(connect, read)`` timeout unless the caller passes its own.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = settings.HTTP_POOL_MAXSIZE,
+        connect_timeout: float = settings.HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = settings.HTTP_READ_TIMEOUT,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+
+        # pool_connections: how many hosts keep a pool; pool_maxsize: connections kept per host
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self) -> "HttpTransport":
+        return self
+
+    def __exit__(self, *exc_info: object):
+        self.close()
+
+
+class AsyncHttpTransport:
+    """
+    Async counterpart of ``HttpTransport`` built on ``httpx.AsyncClient``.
+
+    An instance is bound to the event loop it is first used on; use
+    ``get_async_transport()`` to share one per loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = settings.HTTP_POOL_CONNECTIONS * settings.HTTP_POOL_MAXSIZE,
+        max_keepalive_connections: int = settings.HTTP_POOL_MAXSIZE,
+        connect_timeout: float = settings.HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = settings.HTTP_READ_TIMEOUT,
+    ):
+        self.client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        # requests silently drops None params, httpx would send them as empty strings
+        if params := kwargs.get("params"):
+            kwargs["params"] = {key: value for key, value in params.items() if value is not None}
+        return await self.client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncHttpTransport":
+        return self
+
+    async def __aexit__(self, *exc_info: object):
+        await self.aclose()
+
+
+_transport: HttpTransport | None = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """Returns the process-wide transport, creating it on first use."""
+    global _transport
+    transport = _transport
+    if transport is None:
+        with _transport_lock:
+            transport = _transport
+            if transport is None:
+                transport = _transport = HttpTransport()
+                logger.debug(f"HTTP transport created (timeout={transport.timeout})")
+    return transport
+
+
+_async_transports: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpTransport] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_transport() -> AsyncHttpTransport:
+    """Returns the async transport shared by everything running on the current event loop."""
+    loop = asyncio.get_running_loop()
+    transport = _async_transports.get(loop)
+    if transport is None:
+        transport = _async_transports[loop] = AsyncHttpTransport()
+    return transport
+
+
+async def close_async_transport():
+    """Closes the current event loop's shared async transport, if one was created."""
+    transport = _async_transports.pop(asyncio.get_running_loop(), None)
+    if transport is not None:
+        await transport.aclose()
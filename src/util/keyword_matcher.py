@@ -0,0 +1,149 @@
+"""
+Multi-keyword matcher that finds every keyword in a text with a single scan.
+Usage: from src.util.keyword_matcher import KeywordMatcher
+"""
+
+import re
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from itertools import accumulate
+
+# Joins the texts of a batch into one string; no keyword may contain it, so no match spans two rows
+SEPARATOR = "\x00"
+
+# Above this many keywords, one regex pass over a batch beats one str.find pass per keyword
+COLUMN_SCAN_MAX_KEYWORDS = 200
+
+
+def _trie_pattern(node: dict) -> str:
+    """Regex for a trie node; greedy optional groups make the longest keyword win."""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    return f"(?:{body})?" if "" in node else body
+
+
+class KeywordMatcher:
+    """
+    Finds which keywords occur in a text, equivalent to ``{k for k in keywords if k in text}``.
+
+    The keywords are compiled once into a trie-shaped alternation, so the regex
+    engine walks the text a single time whatever the number of keywords. At each
+    match the longest keyword wins and every shorter keyword contained in it is
+    implied (precomputed); the search then resumes one character after the match
+    start, so overlapping occurrences are not lost either.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keyword for keyword in keywords if keyword))
+        if any(SEPARATOR in keyword for keyword in self.keywords):
+            raise ValueError("Keywords must not contain the batch separator (NUL).")
+
+        trie: dict = {}
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}  # end of keyword
+
+        self._pattern = re.compile(_trie_pattern(trie)) if self.keywords else None
+        self._implied = {
+            keyword: frozenset(other for other in self.keywords if other in keyword) for keyword in self.keywords
+        }
+
+    def find_all(self, text: str) -> set[str]:
+        if self._pattern is None:
+            return set()
+
+        found: set[str] = set()
+        search = self._pattern.search
+        position = 0
+        while (match := search(text, position)) is not None:
+            found |= self._implied[match.group()]
+            position = match.start() + 1
+        return found
+
+    def find_rows(self, texts: Sequence[str]) -> dict[str, set[int]]:
+        """
+        ``find_all`` over a whole column at once, inverted: each keyword found maps to
+        the rows (indexes into ``texts``) that contain it. The texts are joined into
+        one string and each hit is mapped back to its row by offset.
+
+        With up to ``COLUMN_SCAN_MAX_KEYWORDS`` keywords, each keyword is searched
+        across the joined column with ``str.find`` (a C string kernel), jumping to
+        the next row after a hit, so Python only runs once per (row, keyword) hit.
+        Longer lists fall back to the single regex pass, whose cost does not grow
+        with the number of keywords.
+        """
+        if self._pattern is None or not texts:
+            return {}
+
+        blob = SEPARATOR.join(texts)
+        starts = list(accumulate((len(text) + 1 for text in texts), initial=0))
+
+        found: dict[str, set[int]] = {}
+        if len(self.keywords) <= COLUMN_SCAN_MAX_KEYWORDS:
+            find = blob.find
+            for keyword in self.keywords:
+                position = find(keyword)
+                while position != -1:
+                    row = bisect_right(starts, position) - 1
+                    found.setdefault(keyword, set()).add(row)
+                    position = find(keyword, starts[row + 1])
+            return found
+
+        search = self._pattern.search
+        position = 0
+        while (match := search(blob, position)) is not None:
+            position = match.start()
+            row = bisect_right(starts, position) - 1
+            for keyword in self._implied[match.group()]:
+                found.setdefault(keyword, set()).add(row)
+            position += 1
+        return found
+
+
+class PhraseMatcher:
+    """
+    Finds which phrases occur as whole words in a tokenised text (words separated by spaces).
+
+    Single words are found with one set intersection against the text's words;
+    multi-word phrases are only checked, as padded substrings, in texts that
+    contain their first word. Both are independent of how many phrases there are.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(" ".join(phrase.split()) for phrase in phrases if phrase.strip()))
+        self._words = frozenset(phrase for phrase in self.keywords if " " not in phrase)
+        self._phrases: dict[str, list[str]] = {}
+        for phrase in self.keywords:
+            if " " in phrase:
+                self._phrases.setdefault(phrase.split(" ", 1)[0], []).append(phrase)
+        self._first_words = frozenset(self._phrases)
+
+    def find_all(self, text: str) -> set[str]:
+        words = set(text.split())
+        found = words & self._words
+        first_words = words & self._first_words
+        if first_words:
+            padded = f" {text} "
+            found.update(phrase for word in first_words for phrase in self._phrases[word] if f" {phrase} " in padded)
+        return found
+
+    def find_rows(self, texts: Sequence[str]) -> dict[str, set[int]]:
+        """
+        ``find_all`` over a whole column, inverted: each phrase found maps to the rows
+        that contain it. Rows are still visited one by one: a set intersection per row
+        is one C-level pass over its words, while a ``str.find`` per phrase over the
+        joined column rescans the whole column for every phrase.
+        """
+        found: dict[str, set[int]] = {}
+        for row, text in enumerate(texts):
+            for phrase in self.find_all(text):
+                rows = found.get(phrase)
+                if rows is None:
+                    rows = found[phrase] = set()
+                rows.add(row)
+        return found
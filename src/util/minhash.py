@@ -0,0 +1,70 @@
+"""
+MinHash signatures and LSH banding for near-duplicate detection.
+Usage: from src.util.minhash import MinHasher
+
+Hashes are derived from blake2b with fixed seeds, so signatures and bucket keys
+are stable across processes and can be persisted.
+"""
+
+import random
+from collections.abc import Iterable, Sequence
+from hashlib import blake2b
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def stable_hash(value: str, salt: bytes = b"") -> int:
+    """64-bit hash of ``value`` that does not change between runs (unlike ``hash``)."""
+    return int.from_bytes(blake2b(value.encode(), digest_size=8, salt=salt).digest(), "big")
+
+
+class MinHasher:
+    """
+    ``num_perm`` MinHash functions, split into ``bands`` LSH bands of ``num_perm // bands`` rows.
+
+    Two sets with Jaccard similarity ``s`` share at least one band bucket with
+    probability ``1 - (1 - s**rows)**bands``, so candidates come from a few bucket
+    lookups instead of comparing against every stored signature.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    @property
+    def threshold(self) -> float:
+        """Similarity at which a pair becomes a candidate with ~50% probability."""
+        return (1 / self.bands) ** (1 / self.rows)
+
+    def signature(self, shingles: Iterable[str]) -> list[int]:
+        hashes = {stable_hash(shingle) for shingle in shingles}
+        if not hashes:
+            return []
+        return [min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes) for a, b in self._permutations]
+
+    def band_keys(self, signature: Sequence[int]) -> list[int]:
+        """One signed 64-bit bucket key per band (fits an SQLite INTEGER)."""
+        if not signature:
+            return []
+        keys = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows : (band + 1) * self.rows]
+            digest = blake2b(f"{band}:{','.join(map(str, rows))}".encode(), digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "big", signed=True))
+        return keys
+
+    @staticmethod
+    def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+        """Estimated Jaccard similarity of the two sets behind the signatures."""
+        if not first or len(first) != len(second):
+            return 0.0
+        return sum(a == b for a, b in zip(first, second, strict=True)) / len(first)
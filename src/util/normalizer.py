@@ -1,8 +1,12 @@
 import re
 import unicodedata
-from html import unescape
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from functools import lru_cache
 from typing import Any
 
+from src.models import JobListing
+from src.util.html_markdown import html_to_markdown
 from src.util.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -56,6 +60,9 @@ MODALITY_MAP = {
 }
 
 
+VALUE_MAPS = {"country": COUNTRY_MAP, "seniority": SENIORITY_MAP, "modality": MODALITY_MAP}
+
+
 def _safe_str(value: Any) -> str:
     """Convert any value to clean string safely."""
     try:
@@ -76,40 +83,47 @@ def _normalize_text(text: str) -> str:
     return text
 
 
-def normalize_location(raw: Any) -> str:
-    val = _normalize_text(_safe_str(raw))
+# Provider values repeat a lot ("cl", "remote", "2", ...), so each distinct one is mapped only once
+@lru_cache(maxsize=1024)
+def _map_value(value: str, kind: str) -> str:
+    val = _normalize_text(value)
     if not val:
         return "No especificado"
 
-    normalized = COUNTRY_MAP.get(val, val.title())
-    if normalized == val.title() and val not in COUNTRY_MAP:
-        logger.warning(f"Unknown country value: {raw}")
-
-    return normalized
+    mapping = VALUE_MAPS[kind]
+    if val not in mapping:
+        logger.warning(f"Unknown {kind} value: {value}")
+    return mapping.get(val, val.title())
 
 
-def normalize_seniority(raw: Any) -> str:
-    val = _normalize_text(_safe_str(raw))
-    if not val:
-        return "No especificado"
+def normalize_location(raw: Any) -> str:
+    return _map_value(_safe_str(raw), "country")
 
-    normalized = SENIORITY_MAP.get(val, val.title())
-    if normalized == val.title() and val not in SENIORITY_MAP:
-        logger.warning(f"Unknown seniority value: {raw}")
 
-    return normalized
+def normalize_seniority(raw: Any) -> str:
+    return _map_value(_safe_str(raw), "seniority")
 
 
 def normalize_modality(raw: Any) -> str:
-    val = _normalize_text(_safe_str(raw))
-    if not val:
-        return "No especificado"
+    return _map_value(_safe_str(raw), "modality")
+
 
-    normalized = MODALITY_MAP.get(val, val.title())
-    if normalized == val.title() and val not in MODALITY_MAP:
-        logger.warning(f"Unknown modality value: {raw}")
+def parse_datetime(value: Any) -> datetime | None:
+    """Parse a provider timestamp (datetime, ISO-8601 string or Unix seconds) into an aware UTC datetime."""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, int | float) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value, UTC)
+    elif isinstance(value, str) and value.strip():
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError:
+            logger.warning(f"Unknown date value: {value}")
+            return None
+    else:
+        return None
 
-    return normalized
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
 
 
 # def normalize_job_text(raw: str) -> str:
@@ -134,90 +148,84 @@ def normalize_modality(raw: Any) -> str:
 
 
 def html_to_markdown_basic(text: str) -> str:
-    text = unescape(text)
+    return html_to_markdown(text)
+
+
+# Multi-word seniority terms, checked first as substrings (order matters!)
+SENIORITY_PHRASES = [
+    ("senior manager", "Senior Manager"),
+    ("senior director", "Senior Director"),
+    ("senior associate", "Semi-Senior"),
+    ("semi senior", "Semi-Senior"),
+    ("semi-senior", "Semi-Senior"),
+    ("mid-level", "Mid"),
+]
+
+# Single-word terms, in priority order; one alternation finds them all on word boundaries
+SENIORITY_WORDS = [
+    ("principal", "Principal"),
+    ("director", "Director"),
+    ("manager", "Manager"),
+    ("senior", "Senior"),
+    ("lead", "Lead"),
+    ("staff", "Staff"),
+    ("intermediate", "Mid"),
+    ("associate", "Junior"),
+    ("junior", "Junior"),
+    ("mid", "Mid"),
+]
+SENIORITY_WORDS_RE = re.compile(r"\b(?:" + "|".join(re.escape(term) for term, _ in SENIORITY_WORDS) + r")\b")
+SENIORITY_WORD_PRIORITY = {term: (priority, normalized) for priority, (term, normalized) in enumerate(SENIORITY_WORDS)}
+
+# Remote wins over hybrid, hybrid over onsite
+MODALITY_KEYWORDS = [
+    (("remoto", "remote", "100% remoto", "full remote", "teletrabajo", "home office"), "Remote"),
+    (("hibrido", "híbrido", "hybrid", "semi presencial"), "Hybrid"),
+    (("presencial", "onsite", "on-site", "oficina"), "Onsite"),
+]
+
+
+def match_seniority(title_lower: str) -> str:
+    """Seniority level of an already lower-cased title."""
+    for term, normalized in SENIORITY_PHRASES:
+        if term in title_lower:
+            return normalized
 
-    replacements = {
-        r"<strong>(.*?)</strong>": r"**\1**",
-        r"<li>(.*?)</li>": r"- \1\n",
-        r"<br\s*/?>": "\n",
-        r"</p>": "\n\n",
-        r"<.*?>": "",  # remove remaining tags
-    }
+    # Highest-priority word present, wherever it appears in the title
+    found = SENIORITY_WORDS_RE.findall(title_lower)
+    return min(SENIORITY_WORD_PRIORITY[term] for term in found)[1] if found else "No especificado"
 
-    for pattern, repl in replacements.items():
-        text = re.sub(pattern, repl, text, flags=re.S)
 
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
+def match_modality(*texts_lower: str) -> str:
+    """Work modality mentioned in any of the already lower-cased texts, without joining them."""
+    # Plain substring checks: on literal keywords they beat any regex over long descriptions
+    for keywords, modality in MODALITY_KEYWORDS:
+        for text in texts_lower:
+            if any(keyword in text for keyword in keywords):
+                return modality
+
+    return "No especificado"
 
 
 def extract_seniority_from_title(title: str) -> str:
     """Extract seniority level from job title."""
     if not title:
         return "No especificado"
-
-    title_lower = title.lower().strip()
-
-    # Check for multi-word seniority terms first (order matters!)
-    multi_word_terms = [
-        ("senior manager", "Senior Manager"),
-        ("senior director", "Senior Director"),
-        ("senior associate", "Semi-Senior"),
-        ("semi senior", "Semi-Senior"),
-        ("semi-senior", "Semi-Senior"),
-        ("mid-level", "Mid"),
-    ]
-
-    for term, normalized in multi_word_terms:
-        if term in title_lower:
-            return normalized
-
-    # Check for single-word terms
-    single_word_terms = [
-        ("principal", "Principal"),
-        ("director", "Director"),
-        ("manager", "Manager"),
-        ("senior", "Senior"),
-        ("lead", "Lead"),
-        ("staff", "Staff"),
-        ("intermediate", "Mid"),
-        ("associate", "Junior"),
-        ("junior", "Junior"),
-        ("mid", "Mid"),
-    ]
-
-    for term, normalized in single_word_terms:
-        # Use word boundaries to avoid matching substrings
-        pattern = r"\b" + re.escape(term) + r"\b"
-        if re.search(pattern, title_lower):
-            return normalized
-
-    return "No especificado"
+    return match_seniority(title.lower())
 
 
 def extract_modality_from_text(text: str) -> str:
     """Extract work modality from text (title or description)."""
     if not text:
         return "No especificado"
+    return match_modality(text.lower())
 
-    text_lower = text.lower().strip()
-
-    # Check for remote keywords
-    remote_keywords = ["remoto", "remote", "100% remoto", "full remote", "teletrabajo", "home office"]
-    for keyword in remote_keywords:
-        if keyword in text_lower:
-            return "Remote"
 
-    # Check for hybrid keywords
-    hybrid_keywords = ["hibrido", "híbrido", "hybrid", "semi presencial"]
-    for keyword in hybrid_keywords:
-        if keyword in text_lower:
-            return "Hybrid"
-
-    # Check for onsite keywords
-    onsite_keywords = ["presencial", "onsite", "on-site", "oficina"]
-    for keyword in onsite_keywords:
-        if keyword in text_lower:
-            return "Onsite"
-
-    return "No especificado"
+def normalize_jobs(jobs: Iterable[JobListing]) -> Iterator[JobListing]:
+    """
+    Generator stage that fills the fields providers don't send in normalized form.
+    Seniority and modality are left to ``classify_jobs``, which reads the text once.
+    """
+    for job in jobs:
+        job.posted_date = parse_datetime(job.posted_date)
+        yield job
@@ -0,0 +1,109 @@
+"""
+Per-provider request throttling.
+Usage: from src.util.rate_limiter import get_rate_limiter
+
+One token bucket per provider is shared by every thread and event loop of the
+process, so raising pagination/query concurrency never raises the request rate
+above the provider's quota.
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+from src.config import settings
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Allows ``rate`` requests per second on average and bursts of up to ``capacity``.
+
+    Callers reserve a token under a lock and sleep outside it, so waiting workers
+    queue up in order instead of polling. ``pause`` holds every caller back, e.g.
+    for a ``Retry-After``.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token (possibly one not refilled yet) and returns how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        if wait := self._reserve():
+            time.sleep(wait)
+
+    async def aacquire(self):
+        if wait := self._reserve():
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """No token is handed out for the next ``seconds``, and the burst allowance is spent."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+
+class RequestBudget:
+    """Caps the requests one run may send to a provider (thread-safe); ``None`` means no cap."""
+
+    def __init__(self, limit: int | None = None):
+        self.limit = limit
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def spend(self) -> bool:
+        """Takes one request from the budget; False once it is used up."""
+        with self._lock:
+            if self.limit is not None and self.spent >= self.limit:
+                return False
+            self.spent += 1
+            return True
+
+
+def backoff_delay(attempt: int, retry_after: float | None = None) -> float:
+    """
+    Wait before retry number ``attempt`` (0-based): the provider's ``Retry-After`` if
+    it sent one, otherwise "full jitter" exponential backoff, so workers that failed
+    together don't all retry at the same moment.
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, settings.HTTP_BACKOFF_BASE_SECONDS)
+    return random.uniform(0, min(settings.HTTP_BACKOFF_MAX_SECONDS, settings.HTTP_BACKOFF_BASE_SECONDS * 2**attempt))
+
+
+_limiters: dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(source: str, rate: float | None = None, capacity: int | None = None) -> TokenBucket:
+    """
+    Returns the process-wide bucket of ``source``, created on first use with ``rate``
+    and ``capacity`` (default: RATE_LIMITS, or RATE_LIMIT_DEFAULT if not listed, and RATE_LIMIT_BURST).
+    """
+    limiter = _limiters.get(source)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(source)
+            if limiter is None:
+                rate = rate or settings.RATE_LIMITS.get(source, settings.RATE_LIMIT_DEFAULT)
+                capacity = capacity or settings.RATE_LIMIT_BURST
+                limiter = _limiters[source] = TokenBucket(rate, capacity)
+                logger.debug(f"{source}: rate limited to {rate} requests/s (burst {capacity})")
+    return limiter
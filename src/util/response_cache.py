@@ -0,0 +1,229 @@
+"""
+On-disk cache of provider API responses (SQLite).
+Usage: from src.util.response_cache import get_response_cache
+
+Entries are keyed by source + URL + normalised query params and served without a
+request while younger than ``ttl_seconds``. Older entries that carry an ETag or
+Last-Modified are revalidated with a conditional request, and a 304 reuses the
+stored body. The file is kept under ``max_bytes`` by evicting the least recently
+used entries.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+import requests
+
+from src.config import settings
+from src.util.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS response (
+    key TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_response_accessed_at ON response (accessed_at);
+"""
+
+
+@dataclass
+class CachedResponse:
+    """The parts of a ``requests``/``httpx`` response the clients read, rebuilt from the cache."""
+
+    status_code: int
+    content: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+    key: str = ""
+    fresh: bool = True  # younger than the TTL: usable without asking the provider
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if etag := self.headers.get("ETag"):
+            headers["If-None-Match"] = etag
+        if last_modified := self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+
+def cache_key(source: str, url: str, params: dict[str, Any] | None = None) -> str:
+    """Hash of the request, with params sorted and ``None`` values dropped as the transports do."""
+    normalised = sorted((str(name), str(value)) for name, value in (params or {}).items() if value is not None)
+    return hashlib.sha256(json.dumps([source, url, normalised]).encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache shared by the clients (thread-safe).
+
+    ``stats`` counts ``hits`` (fresh entries), ``revalidated`` (304 answers),
+    ``misses``, ``stores`` and ``evictions``.
+    """
+
+    def __init__(
+        self,
+        path: Path = settings.HTTP_CACHE_PATH,
+        ttl_seconds: float = settings.HTTP_CACHE_TTL_SECONDS,
+        max_bytes: int = settings.HTTP_CACHE_MAX_BYTES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats: Counter[str] = Counter()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+    def lookup(self, source: str, url: str, params: dict[str, Any] | None = None) -> CachedResponse | None:
+        """
+        The cached response for the request, or ``None`` on a miss. A stale entry is
+        only returned if it can be revalidated (``fresh`` is False).
+        """
+        key = cache_key(source, url, params)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status, content_type, etag, last_modified, body, stored_at FROM response WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                self._connection.execute("UPDATE response SET accessed_at = ? WHERE key = ?", (now, key))
+                self._connection.commit()
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+
+        status, content_type, etag, last_modified, body, stored_at = row
+        headers = {
+            name: value
+            for name, value in (("Content-Type", content_type), ("ETag", etag), ("Last-Modified", last_modified))
+            if value
+        }
+        cached = CachedResponse(status, body, headers, key, fresh=now - stored_at < self.ttl_seconds)
+        if cached.fresh:
+            self.stats["hits"] += 1
+        elif not cached.validators():
+            self.stats["misses"] += 1
+            return None
+        return cached
+
+    def store(
+        self,
+        source: str,
+        url: str,
+        params: dict[str, Any] | None,
+        response: requests.Response | httpx.Response,
+        cached: CachedResponse | None = None,
+    ) -> requests.Response | httpx.Response | CachedResponse:
+        """
+        Records the provider's answer to a request and returns the response to use:
+        the cached one again on a 304, ``response`` itself otherwise. Only 200s are stored.
+        """
+        now = time.time()
+        if response.status_code == 304 and cached is not None:
+            with self._lock:
+                self._connection.execute("UPDATE response SET stored_at = ? WHERE key = ?", (now, cached.key))
+                self._connection.commit()
+            self.stats["revalidated"] += 1
+            cached.fresh = True
+            return cached
+
+        if response.status_code != 200:
+            return response
+
+        body = response.content
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key(source, url, params),
+                    source,
+                    url,
+                    response.status_code,
+                    response.headers.get("Content-Type"),
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._evict(now)
+            self._connection.commit()
+        self.stats["stores"] += 1
+        return response
+
+    def _evict(self, now: float):
+        """Drops expired entries that cannot be revalidated, then the least recently used ones over ``max_bytes``."""
+        expired = self._connection.execute(
+            "DELETE FROM response WHERE stored_at < ? AND etag IS NULL AND last_modified IS NULL",
+            (now - self.ttl_seconds,),
+        ).rowcount
+
+        excess = (self._connection.execute("SELECT SUM(size) FROM response").fetchone()[0] or 0) - self.max_bytes
+        evicted = []
+        if excess > 0:
+            for key, size in self._connection.execute("SELECT key, size FROM response ORDER BY accessed_at"):
+                evicted.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            self._connection.executemany("DELETE FROM response WHERE key = ?", evicted)
+
+        self.stats["evictions"] += expired + len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM response")
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Returns the process-wide response cache, or ``None`` if HTTP_CACHE_ENABLED is off."""
+    global _cache
+    if not settings.HTTP_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+                logger.debug(f"HTTP response cache opened at {_cache.path} (ttl={_cache.ttl_seconds}s)")
+    return _cache